@@ -52,21 +52,25 @@ class FPS:
         self.font: pygame.font.Font = pygame.font.Font(
             resource_path(Path(DISPLAY_FONT)), STAT_FONT_SIZE
         )
+        self.fps_text: str = f"FPS {round(self.clock.get_fps(), 2)}"
         self.text: pygame.Surface = self.font.render(
-            f"FPS {round(self.clock.get_fps(), 2)}",
+            self.fps_text,
             True,
             (255, 255, 255),
             BACKGROUND_COLOR,
         )
 
     def render(self: Self, display: pygame.Surface, x: float, y: float) -> None:
-        """Renders the fps to the display object at x,y coordinates"""
-        self.text = self.font.render(
-            f"FPS {round(self.clock.get_fps(), 2)}",
-            True,
-            (255, 255, 255),
-            BACKGROUND_COLOR,
-        )
+        """Renders the fps to the display object at x,y coordinates (only re-rendering the text when it changes)"""
+        fps_text: str = f"FPS {round(self.clock.get_fps(), 2)}"
+        if fps_text != self.fps_text:
+            self.fps_text = fps_text
+            self.text = self.font.render(
+                fps_text,
+                True,
+                (255, 255, 255),
+                BACKGROUND_COLOR,
+            )
         display.blit(self.text, (x, y))
 
 
@@ -159,6 +163,8 @@ class BlobDisplayPygame:
         self.stat_font: pygame.font.Font = pygame.font.Font(
             resource_path(Path(DISPLAY_FONT)), STAT_FONT_SIZE
         )
+        # Last text rendered at each orientation, and its surface, so it's only rendered again when it changes
+        self.text_cache: Dict[Tuple[int, int], Tuple[str, pygame.Surface]] = {}
 
         pygame.display.set_caption(WINDOW_TITLE)
         pygame.display.set_icon(self.img)
@@ -225,13 +231,14 @@ class BlobDisplayPygame:
         and something to do upon that key being pressed.
         This is presumed to be used for each iteration of a frame before drawing.
         """
-        # Check for events
+        # Check for events (one dict lookup per key press, which is the dispatch)
         for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                keyboard_events[pygame.K_ESCAPE]()
             if event.type == pygame.KEYDOWN:
-                if keyboard_events.get(event.key) is not None:
-                    keyboard_events[event.key]()
+                handler: Callable[[], None] = keyboard_events.get(event.key)
+                if handler is not None:
+                    handler()
+            elif event.type == pygame.QUIT:
+                keyboard_events[pygame.K_ESCAPE]()
 
     def fps_clock_tick(self: Self, fps: int) -> None:
         """Control the FPS rate by sending the desired rate here every frame of while loop"""
@@ -265,12 +272,18 @@ class BlobDisplayPygame:
         on how to offset the size of the text itself (so, for example, it doesn't go offscreen). Use the
         class vars for x/y orientation hints, e.g. (BlobDisplay.TEXT_LEFT, BlobDisplay.TEXT_BOTTOM)
         """
-        text_surface = self.stat_font.render(
-            text,
-            True,
-            (255, 255, 255),
-            BACKGROUND_COLOR,
-        )
+        cached: Tuple[str, pygame.Surface] = self.text_cache.get(orientation)
+
+        if cached is not None and cached[0] == text:
+            text_surface = cached[1]
+        else:
+            text_surface = self.stat_font.render(
+                text,
+                True,
+                (255, 255, 255),
+                BACKGROUND_COLOR,
+            )
+            self.text_cache[orientation] = (text, text_surface)
 
         offset_x: float = 0.0
         offset_y: float = 0.0
@@ -133,7 +133,8 @@ class BlobPygameFactory:
 
     def reset(self: Self, num_blobs: int = NUM_BLOBS) -> None:
         """Resets to default state"""
-        pass
+        # Swallows keep changing radii, so the pre-rendered circles of the last universe are mostly dead weight
+        BlobSurfacePygame.reset_circle_atlas()
 
     def new_blob_surface(
         self: Self,
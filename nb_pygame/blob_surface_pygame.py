@@ -7,7 +7,7 @@ by Jason Mott, copyright 2024
 """
 
 from pathlib import Path
-from typing import ClassVar, Tuple, Self, cast
+from typing import ClassVar, Dict, List, Tuple, Self, cast
 import numpy as np
 import numpy.typing as npt
 import math, random
@@ -65,6 +65,12 @@ class BlobSurfacePygame:
     set_orbital_pos_vel(orbital: BlobSurface) -> Tuple[float,float,float]
         Sets orbital to a position appropriate for an orbital of this blob, and returns velocity as a tuple
 
+    get_circle(color: Tuple[int, int, int], radius: float) -> Tuple[pygame.Surface, pygame.Rect]
+        Returns the circle atlas and the area of it holding a pre-rendered circle of the given color and radius
+
+    reset_circle_atlas() -> None
+        Empties the circle atlas, so circles of sizes no longer in use don't pile up (call on a start over)
+
     resize(radius: float) -> None
         Sets a new radius for this blob
 
@@ -154,12 +160,23 @@ class BlobSurfacePygame:
         "shade_index",
         "alpha_image",
         "mask_image",
+        "mask_radius",
     )
 
     center_blob_x: ClassVar[float] = BlobGlobalVars.universe_size_w / 2
     center_blob_y: ClassVar[float] = BlobGlobalVars.universe_size_h / 2
     center_blob_z: ClassVar[float] = BlobGlobalVars.universe_size_d / 2
     LIGHT_RADIUS_MULTI: ClassVar[float] = 6
+    # Every flat circle is pre-rendered once into one shared atlas surface (packed in rows, or shelves),
+    # so they can all be drawn from the same source with Surface.blits()
+    CIRCLE_ATLAS_WIDTH: ClassVar[int] = 1024
+    circle_atlas: ClassVar[pygame.Surface] = None
+    circle_rects: ClassVar[Dict[Tuple[Tuple[int, int, int], float], pygame.Rect]] = {}
+    # x and y of the next free spot in the atlas, and the height of the current shelf
+    circle_shelf: ClassVar[List[int]] = [0, 0, 0]
+    # The center blob's glow flickers by a random 1-4 pixels, drawn once up front and cycled through
+    GLOW_JITTER: ClassVar[List[int]] = [random.randint(1, 4) for _ in range(256)]
+    glow_step: ClassVar[int] = 0
 
     def __init__(
         self: Self,
@@ -213,6 +230,7 @@ class BlobSurfacePygame:
         self.shade_index: int = self.animation_cache_size
         self.alpha_image: pygame.Surface = None
         self.mask_image: pygame.Surface = None
+        self.mask_radius: float = None
         self.draw_alpha_image()
         self.draw_mask()
 
@@ -225,6 +243,61 @@ class BlobSurfacePygame:
         """
         pass
 
+    @staticmethod
+    def get_circle(
+        color: Tuple[int, int, int], radius: float
+    ) -> Tuple[pygame.Surface, pygame.Rect]:
+        """
+        Returns the circle atlas and the area of it holding a pre-rendered circle of the given color and radius
+        (on a color keyed background), rendered into the atlas the first time it's asked for
+        """
+        key: Tuple[Tuple[int, int, int], float] = (color, radius)
+        rect: pygame.Rect = BlobSurfacePygame.circle_rects.get(key)
+
+        if rect is None:
+            size: int = math.ceil(radius * 2)
+            shelf: List[int] = BlobSurfacePygame.circle_shelf
+            atlas: pygame.Surface = BlobSurfacePygame.circle_atlas
+
+            # Start a new shelf when this one is full
+            if shelf[0] + size > BlobSurfacePygame.CIRCLE_ATLAS_WIDTH:
+                shelf[0] = 0
+                shelf[1] += shelf[2]
+                shelf[2] = 0
+
+            # Grow the atlas when it runs out of room, keeping what's already in it
+            width: int = max(BlobSurfacePygame.CIRCLE_ATLAS_WIDTH, size)
+            if atlas is None or atlas.get_height() < shelf[1] + size:
+                height: int = max(
+                    shelf[1] + size, 0 if atlas is None else atlas.get_height() * 2
+                )
+                new_atlas: pygame.Surface = pygame.Surface(
+                    (max(width, 0 if atlas is None else atlas.get_width()), height)
+                )
+                new_atlas.set_colorkey((0, 0, 0))
+                new_atlas.fill((0, 0, 0))
+                if atlas is not None:
+                    new_atlas.blit(atlas, (0, 0))
+                atlas = BlobSurfacePygame.circle_atlas = new_atlas
+
+            rect = pygame.Rect(shelf[0], shelf[1], size, size)
+            pygame.draw.circle(
+                atlas, color, (rect.x + radius, rect.y + radius), radius
+            )
+            BlobSurfacePygame.circle_rects[key] = rect
+
+            shelf[0] += size
+            shelf[2] = max(shelf[2], size)
+
+        return BlobSurfacePygame.circle_atlas, rect
+
+    @staticmethod
+    def reset_circle_atlas() -> None:
+        """Empties the circle atlas, so circles of sizes no longer in use don't pile up (call on a start over)"""
+        BlobSurfacePygame.circle_atlas = None
+        BlobSurfacePygame.circle_rects.clear()
+        BlobSurfacePygame.circle_shelf[:] = [0, 0, 0]
+
     def resize(self: Self, radius: float) -> None:
         """Sets a new radius for this blob"""
         self.radius = radius
@@ -256,11 +329,14 @@ class BlobSurfacePygame:
         """
         Create/draw the mask, which will hide the parts of the overlay that go beyond the boundary
         of the main blob. This is called in the constructor and from get_lighting_blob().
-        Created the first time it's called, just a fill and draw every time after
+        Created the first time it's called, and only drawn again when the radius has changed since
         """
         if self.mask_image is None:
             self.mask_image = pygame.Surface(self.get_size(), pygame.SRCALPHA)
+        elif self.mask_radius == self.radius:
+            return
 
+        self.mask_radius = self.radius
         self.mask_image.fill(self.colorkey)
         pygame.draw.circle(
             self.mask_image,
@@ -449,7 +525,7 @@ class BlobSurfacePygame:
             self.position = pos
 
         if lighting:
-            self.py_universe.universe.blit(
+            self.py_universe.queue_blit(
                 self.get_lighting_blob(),
                 (
                     self.position[0] - self.width_center,
@@ -457,15 +533,13 @@ class BlobSurfacePygame:
                 ),
             )
         else:
-            self.alpha_image.blit(
-                self.mask_image, (0, 0), special_flags=pygame.BLEND_RGBA_MIN
-            )
-            self.py_universe.universe.blit(
-                self.alpha_image,
-                (
-                    self.position[0] - self.width_center,
-                    self.position[1] - self.height_center,
-                ),
+            # No lighting is just a flat circle, straight from the atlas
+            atlas, rect = BlobSurfacePygame.get_circle(self.color, self.radius)
+            self.py_universe.queue_blit(
+                atlas,
+                (self.position[0] - self.radius, self.position[1] - self.radius),
+                0,
+                rect,
             )
         # Uncomment for writing labels on blobs
         # mass_text = blob_font.render(
@@ -494,29 +568,31 @@ class BlobSurfacePygame:
         if pos is not None:
             self.position = pos
 
-        pygame.draw.circle(
-            self.py_universe.universe,
-            self.color,
-            (self.position[0], self.position[1]),
-            self.radius,
+        atlas, rect = BlobSurfacePygame.get_circle(self.color, self.radius)
+        self.py_universe.queue_blit(
+            atlas,
+            (self.position[0] - self.radius, self.position[1] - self.radius),
+            0,
+            rect,
         )
 
         if lighting:
-            glow_radius = self.radius + random.randint(1, 4)
+            glow_step: int = BlobSurfacePygame.glow_step
+            glow_radius = self.radius + BlobSurfacePygame.GLOW_JITTER[glow_step]
+            BlobSurfacePygame.glow_step = (glow_step + 1) & 255
         else:
             glow_radius = self.radius
 
-        surf = pygame.Surface((glow_radius * 2, glow_radius * 2))
-
-        pygame.draw.circle(surf, self.color, (glow_radius, glow_radius), glow_radius)
-
-        self.py_universe.universe.blit(
-            surf,
+        # The glow's background is color keyed in the atlas, adding black was a no-op anyway
+        atlas, rect = BlobSurfacePygame.get_circle(self.color, glow_radius)
+        self.py_universe.queue_blit(
+            atlas,
             (
                 self.position[0] - glow_radius,
                 self.position[1] - glow_radius,
             ),
-            special_flags=pygame.BLEND_RGB_ADD,
+            pygame.BLEND_RGB_ADD,
+            rect,
         )
 
     def destroy(self: Self) -> None:
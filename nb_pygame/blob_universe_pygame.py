@@ -6,7 +6,7 @@ Protocol class implementation to represent an object that holds and controls a d
 by Jason Mott, copyright 2024
 """
 
-from typing import Any, Tuple, Self
+from typing import Any, List, Tuple, Self
 
 import pygame
 
@@ -52,23 +52,58 @@ class BlobUniversePygame:
         Returns a tuple of offset values from center to given x,y,z
 
     fill(self: Self, color: Tuple[int, int, int]) -> None
-        Fill the entire area wit a particular color to prepare for drawing another screen
+        Fill the entire area wit a particular color to prepare for drawing another screen (only the parts drawn
+        on since the last fill are actually filled, the rest is still that color)
 
     clear() -> None
         Used to delete and properly clean up blobs (for a start over, for example)
 
+    queue_blit(source: pygame.Surface, dest: Tuple[float, float], special_flags: int = 0, area: pygame.Rect = None) -> None
+        Adds a blit onto the universe to the queue, they are all drawn with one Surface.blits() call by flush_blits()
+        (area is the part of source to draw, for sprites that live in an atlas)
+
+    flush_blits() -> None
+        Draws all the queued blits onto the universe in one call, and empties the queue
+
     """
 
     def __init__(self: Self, size_w: float, size_h: float):
         self.universe: pygame.Surface = pygame.Surface([size_w, size_h])
+        self.blit_queue: List[Tuple[pygame.Surface, Tuple[float, float], Any, int]] = []
+
+        # Areas drawn on since the last fill, and that fill's color (None means the whole universe needs it)
+        self.dirty_rects: List[pygame.Rect] = None
+        self.fill_color: Tuple[int, int, int] = None
 
     def get_framework(self: Self) -> Any:
         """
         Returns the underlying framework implementation of the drawing area for the universe, mostly for use
         in an implementation of BlobSurface within the same framework for direct access
         """
+        self.flush_blits()
         return self.universe
 
+    def queue_blit(
+        self: Self,
+        source: pygame.Surface,
+        dest: Tuple[float, float],
+        special_flags: int = 0,
+        area: pygame.Rect = None,
+    ) -> None:
+        """
+        Adds a blit onto the universe to the queue, they are all drawn with one Surface.blits() call by flush_blits()
+        (source must not be changed until then, area is the part of source to draw, for sprites that live in an atlas)
+        """
+        self.blit_queue.append((source, dest, area, special_flags))
+
+    def flush_blits(self: Self) -> None:
+        """Draws all the queued blits onto the universe in one call, and empties the queue"""
+        if self.blit_queue:
+            rects: List[pygame.Rect] = self.universe.blits(self.blit_queue)
+            if self.dirty_rects is not None:
+                self.dirty_rects.extend(rects)
+            self.blit_queue.clear()
+
     def get_width(self: Self) -> float:
         """Returns the current width of the universe object"""
         return self.universe.get_width()
@@ -93,11 +128,25 @@ class BlobUniversePygame:
         return (center_x - x, center_y - y, center_z - z)
 
     def fill(self: Self, color: Tuple[int, int, int]) -> None:
-        """Fill the entire area wit a particular color to prepare for drawing another screen"""
-        self.universe.fill(color)
+        """
+        Fill the entire area wit a particular color to prepare for drawing another screen (only the parts drawn
+        on since the last fill are actually filled, the rest is still that color)
+        """
+        self.blit_queue.clear()
+
+        if self.dirty_rects is None or self.fill_color != color:
+            self.universe.fill(color)
+        else:
+            for rect in self.dirty_rects:
+                self.universe.fill(color, rect)
+
+        self.dirty_rects = []
+        self.fill_color = color
 
     def clear(self: Self) -> None:
         """Used to delete and properly clean up blobs (for a start over, for example)"""
+        self.blit_queue.clear()
+        self.dirty_rects = None
         self.universe = pygame.Surface(
             [BlobGlobalVars.universe_size_w, BlobGlobalVars.universe_size_h]
         )
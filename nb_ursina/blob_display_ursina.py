@@ -414,13 +414,20 @@ class BlobDisplayUrsina:
         and something to do upon that key being pressed.
         This is presumed to be used for each iteration of a frame before drawing.
         """
-        for _ in range(len(self.event_queue.input_queue)):
-            key = self.event_queue.input_queue.popleft()
-            if self.key_ints.get(key) is not None:
-                if keyboard_events.get(self.key_ints[key]) is not None:
-                    keyboard_events[self.key_ints[key]]()
-                if self.urs_keyboard_events.get(self.key_ints[key]) is not None:
-                    self.urs_keyboard_events[self.key_ints[key]]()
+        input_queue = self.event_queue.input_queue
+        key_ints: Dict[str, int] = self.key_ints
+        urs_keyboard_events: Dict[int, Callable[[], None]] = self.urs_keyboard_events
+
+        # One dict lookup per key press for each table, which is the dispatch
+        for _ in range(len(input_queue)):
+            key_int: int = key_ints.get(input_queue.popleft())
+            if key_int is not None:
+                handler: Callable[[], None] = keyboard_events.get(key_int)
+                if handler is not None:
+                    handler()
+                handler = urs_keyboard_events.get(key_int)
+                if handler is not None:
+                    handler()
 
     def fps_clock_tick(self: Self, fps: int) -> None:
         """Control the FPS rate by sending the desired rate here every frame of while loop"""
@@ -30,6 +30,8 @@ from .massive_blob import MassiveBlob
 from .blob_surface import BlobSurface
 from .blob_save_load import BlobSaveLoad
 from .blob_physics import BlobPhysics
+from .blob_kernels import BlobKernels
+from .blob_octree import BlobOctree
 from .blob_universe import BlobUniverse
 from .blob_display import BlobDisplay
 from .blob_plugin_factory import BlobPluginFactory
@@ -192,10 +192,10 @@ class BlobGlobalVars:
     blob_scale: ClassVar[float] = BLOB_SCALE
     scale_blob_mass_with_size: ClassVar[bool] = True
 
-    # 1 AU = SCALE_FACTOR pixels
+    # 1 AU = AU_SCALE_FACTOR pixels
     scale_down: ClassVar[float] = SCALE_DOWN
 
-    # SCALE_FACTOR pixels = 1 AU
+    # AU_SCALE_FACTOR pixels = 1 AU
     scale_up: ClassVar[float] = SCALE_UP
 
     universe_size: ClassVar[float] = UNIVERSE_SIZE
@@ -0,0 +1,719 @@
+"""
+Newton's Laws, a simulator of physics at the scale of space
+
+A static class used to provide the array based physics kernels for BlobPlotter
+
+by Jason Mott, copyright 2024
+"""
+
+import math
+import os
+from typing import Callable, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+from .globals import *
+from .blob_octree import BlobOctree, FASTMATH
+
+try:
+    import numba
+    from numba import njit, prange
+
+    NUMBA_AVAILABLE: bool = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+CUDA_AVAILABLE: bool = False
+if NUMBA_AVAILABLE:
+    try:
+        from numba import cuda
+
+        CUDA_AVAILABLE = cuda.is_available()
+    except Exception:
+        CUDA_AVAILABLE = False
+
+__author__ = "Jason Mott"
+__copyright__ = "Copyright 2024"
+__license__ = "GPL 3.0"
+__version__ = VERSION
+__maintainer__ = "Jason Mott"
+__email__ = "github@jasonmott.com"
+__status__ = "In Progress"
+
+
+if NUMBA_AVAILABLE:
+
+    numba.set_num_threads(min(os.cpu_count() or 1, numba.config.NUMBA_NUM_THREADS))
+
+    # A blob's distance to itself is 0, so its (discarded) pull on itself divides by zero. FASTMATH (from
+    # blob_octree) drops the no-nan/no-inf assumptions so that inf survives to be masked out, and the
+    # numpy error model makes the division give inf rather than raise ZeroDivisionError
+    @njit(fastmath=FASTMATH, error_model="numpy", cache=True)
+    def _pull(
+        xi: float,
+        yi: float,
+        zi: float,
+        x: npt.NDArray,
+        y: npt.NDArray,
+        z: npt.NDArray,
+        gm: npt.NDArray,
+        range2: float,
+        wrap_size: float,
+    ) -> Tuple[float, float, float]:
+        """
+        Returns the acceleration at (xi, yi, zi) caused by every blob within range. The j loop has no branches
+        so it vectorizes, and works in the precision of x/y/z/gm (float32 or float64)
+        """
+        zero = x.dtype.type(0)
+        ax = zero
+        ay = zero
+        az = zero
+
+        if wrap_size > zero:
+            for j in range(x.shape[0]):
+                dx = x[j] - xi
+                dy = y[j] - yi
+                dz = z[j] - zi
+                dx -= wrap_size * math.floor(dx / wrap_size + 0.5)
+                dy -= wrap_size * math.floor(dy / wrap_size + 0.5)
+                dz -= wrap_size * math.floor(dz / wrap_size + 0.5)
+                d2 = dx * dx + dy * dy + dz * dz
+                f = gm[j] / (d2 * math.sqrt(d2))
+                f = f if (d2 < range2 and d2 > zero) else zero
+                ax += dx * f
+                ay += dy * f
+                az += dz * f
+        else:
+            for j in range(x.shape[0]):
+                dx = x[j] - xi
+                dy = y[j] - yi
+                dz = z[j] - zi
+                d2 = dx * dx + dy * dy + dz * dz
+                f = gm[j] / (d2 * math.sqrt(d2))
+                f = f if (d2 < range2 and d2 > zero) else zero
+                ax += dx * f
+                ay += dy * f
+                az += dz * f
+
+        return ax, ay, az
+
+    @njit(parallel=True, fastmath=FASTMATH, cache=True)
+    def _compute_accelerations(
+        pos: npt.NDArray,
+        mass: npt.NDArray,
+        g: float,
+        gravitational_range: float,
+        wrap_size: float,
+        acc: npt.NDArray,
+    ) -> None:
+        """Numba version of BlobKernels.accelerations(), one i blob per thread"""
+        range2 = pos.dtype.type(gravitational_range * gravitational_range)
+        wrap_size = pos.dtype.type(wrap_size)
+
+        x = pos[:, 0].copy()
+        y = pos[:, 1].copy()
+        z = pos[:, 2].copy()
+        gm = mass * pos.dtype.type(g)
+
+        for i in prange(pos.shape[0]):
+            acc[i, 0], acc[i, 1], acc[i, 2] = _pull(
+                x[i], y[i], z[i], x, y, z, gm, range2, wrap_size
+            )
+
+    @njit(parallel=True, fastmath=FASTMATH, cache=True)
+    def _compute_step(
+        kernel_pos: npt.NDArray,
+        kernel_mass: npt.NDArray,
+        g: float,
+        gravitational_range: float,
+        wrap_size: float,
+        timescale: float,
+        pos: npt.NDArray,
+        vel: npt.NDArray,
+        prev_pos: npt.NDArray,
+    ) -> None:
+        """
+        Numba version of BlobKernels.step(), one i blob per thread. Gravity is calculated from kernel_pos/kernel_mass
+        (possibly float32, see BlobKernels.float32_inputs()) and used to kick vel and then drift pos, so each blob's
+        state is read and written once and no (N,N) temporaries are made. kernel_pos is copied into columns first,
+        so moving a blob can't affect the pull on the blobs after it
+        """
+        range2 = kernel_pos.dtype.type(gravitational_range * gravitational_range)
+        wrap_size = kernel_pos.dtype.type(wrap_size)
+
+        x = kernel_pos[:, 0].copy()
+        y = kernel_pos[:, 1].copy()
+        z = kernel_pos[:, 2].copy()
+        gm = kernel_mass * kernel_pos.dtype.type(g)
+
+        for i in prange(kernel_pos.shape[0]):
+            ax, ay, az = _pull(x[i], y[i], z[i], x, y, z, gm, range2, wrap_size)
+
+            vel[i, 0] += ax * timescale
+            vel[i, 1] += ay * timescale
+            vel[i, 2] += az * timescale
+
+            for k in range(3):
+                prev_pos[i, k] = pos[i, k]
+                pos[i, k] += vel[i, k] * timescale
+
+    @njit(cache=True)
+    def _append_pair(
+        pairs: npt.NDArray, dist: npt.NDArray, count: int, i: int, j: int, d: float
+    ) -> Tuple[npt.NDArray, npt.NDArray]:
+        """Stores pair (i, j) at index count, growing the output arrays when they are full"""
+        if count == pairs.shape[0]:
+            bigger_pairs = np.empty((2 * count, 2), dtype=np.int64)
+            bigger_dist = np.empty(2 * count, dtype=np.float64)
+            bigger_pairs[:count] = pairs
+            bigger_dist[:count] = dist
+            pairs = bigger_pairs
+            dist = bigger_dist
+
+        pairs[count, 0] = i
+        pairs[count, 1] = j
+        dist[count] = d
+        return pairs, dist
+
+    @njit(cache=True)
+    def _touching_pairs(
+        pos: npt.NDArray,
+        radius: npt.NDArray,
+        cell_size: float,
+        wrap_cells: int,
+        wrap_size: float,
+    ) -> Tuple[npt.NDArray, npt.NDArray]:
+        """
+        Numba version of BlobKernels.touching_pairs(). Blobs 1..N-1 are binned into a uniform grid of cells at
+        least 2 * their largest radius wide, so a blob can only touch blobs in its own or the 26 surrounding cells.
+        Cells are found by binary search in the sorted cell keys. Blob 0 (the center blob) is much bigger than the
+        cells, so it's checked against every blob. With wrap_cells > 0 the grid wraps around every wrap_cells cells
+        """
+        n = pos.shape[0]
+        pairs = np.empty((64, 2), dtype=np.int64)
+        dist = np.empty(64, dtype=np.float64)
+        count = 0
+
+        # Cell of every blob, relative to the lowest corner when the universe doesn't wrap
+        cells = np.empty((n, 3), dtype=np.int64)
+        dims = np.empty(3, dtype=np.int64)
+        for k in range(3):
+            if wrap_cells > 0:
+                for b in range(1, n):
+                    cells[b, k] = int(math.floor(pos[b, k] / cell_size)) % wrap_cells
+                dims[k] = wrap_cells
+            else:
+                lo = pos[1, k]
+                for b in range(2, n):
+                    lo = min(lo, pos[b, k])
+                hi = 0
+                for b in range(1, n):
+                    cells[b, k] = int(math.floor((pos[b, k] - lo) / cell_size))
+                    hi = max(hi, cells[b, k])
+                dims[k] = hi + 1
+
+        keys = np.empty(n - 1, dtype=np.int64)
+        for b in range(1, n):
+            keys[b - 1] = (cells[b, 0] * dims[1] + cells[b, 1]) * dims[2] + cells[b, 2]
+        order = np.argsort(keys) + 1
+        sorted_keys = keys[order - 1]
+
+        # The center blob against everything
+        for j in range(1, n):
+            dx = pos[j, 0] - pos[0, 0]
+            dy = pos[j, 1] - pos[0, 1]
+            dz = pos[j, 2] - pos[0, 2]
+            if wrap_size > 0.0:
+                dx -= wrap_size * math.floor(dx / wrap_size + 0.5)
+                dy -= wrap_size * math.floor(dy / wrap_size + 0.5)
+                dz -= wrap_size * math.floor(dz / wrap_size + 0.5)
+            d2 = dx * dx + dy * dy + dz * dz
+            touch = radius[0] + radius[j]
+            if d2 <= touch * touch:
+                pairs, dist = _append_pair(
+                    pairs, dist, count, 0, j, math.sqrt(d2)
+                )
+                count += 1
+
+        for i in range(1, n):
+            for o in range(27):
+                cx = cells[i, 0] + (o % 3) - 1
+                cy = cells[i, 1] + ((o // 3) % 3) - 1
+                cz = cells[i, 2] + (o // 9) - 1
+
+                if wrap_cells > 0:
+                    cx %= wrap_cells
+                    cy %= wrap_cells
+                    cz %= wrap_cells
+                elif (
+                    cx < 0
+                    or cy < 0
+                    or cz < 0
+                    or cx >= dims[0]
+                    or cy >= dims[1]
+                    or cz >= dims[2]
+                ):
+                    continue
+
+                key = (cx * dims[1] + cy) * dims[2] + cz
+                s = np.searchsorted(sorted_keys, key)
+
+                while s < n - 1 and sorted_keys[s] == key:
+                    j = order[s]
+                    s += 1
+                    if j <= i:
+                        continue
+
+                    dx = pos[j, 0] - pos[i, 0]
+                    dy = pos[j, 1] - pos[i, 1]
+                    dz = pos[j, 2] - pos[i, 2]
+                    if wrap_size > 0.0:
+                        dx -= wrap_size * math.floor(dx / wrap_size + 0.5)
+                        dy -= wrap_size * math.floor(dy / wrap_size + 0.5)
+                        dz -= wrap_size * math.floor(dz / wrap_size + 0.5)
+                    d2 = dx * dx + dy * dy + dz * dz
+                    touch = radius[i] + radius[j]
+                    if d2 <= touch * touch:
+                        pairs, dist = _append_pair(
+                            pairs, dist, count, i, j, math.sqrt(d2)
+                        )
+                        count += 1
+
+        return pairs[:count], dist[:count]
+
+
+if CUDA_AVAILABLE:
+
+    # Number of threads per block, and number of j blobs loaded into shared memory at a time
+    CUDA_TILE: int = 128
+
+    def _make_cuda_gravity_kernel(float_type: "numba.types.Float") -> Callable:
+        """
+        Returns the CUDA gravity kernel for float_type (numba.float32 or numba.float64). The shared memory tiles,
+        accumulators and constants all use float_type, so float32 inputs never get promoted to FP64 on the GPU
+        """
+
+        @cuda.jit
+        def _cuda_gravity_kernel(
+            pos: npt.NDArray,
+            mass: npt.NDArray,
+            g: float,
+            range2: float,
+            wrap_size: float,
+            acc: npt.NDArray,
+        ) -> None:
+            """
+            CUDA version of BlobKernels.accelerations(), one i blob per thread. Each block loads CUDA_TILE j blobs
+            into shared memory at a time so every thread in the block can reuse them
+            """
+            sx = cuda.shared.array(CUDA_TILE, float_type)
+            sy = cuda.shared.array(CUDA_TILE, float_type)
+            sz = cuda.shared.array(CUDA_TILE, float_type)
+            sm = cuda.shared.array(CUDA_TILE, float_type)
+
+            zero = float_type(0)
+            half = float_type(0.5)
+            g_f = float_type(g)
+            range2_f = float_type(range2)
+            wrap_size_f = float_type(wrap_size)
+
+            n = pos.shape[0]
+            i = cuda.grid(1)
+            tx = cuda.threadIdx.x
+
+            xi = zero
+            yi = zero
+            zi = zero
+            if i < n:
+                xi = pos[i, 0]
+                yi = pos[i, 1]
+                zi = pos[i, 2]
+
+            ax = zero
+            ay = zero
+            az = zero
+
+            for tile in range(0, n, CUDA_TILE):
+                j = tile + tx
+                if j < n:
+                    sx[tx] = pos[j, 0]
+                    sy[tx] = pos[j, 1]
+                    sz[tx] = pos[j, 2]
+                    sm[tx] = mass[j]
+                else:
+                    sx[tx] = zero
+                    sy[tx] = zero
+                    sz[tx] = zero
+                    sm[tx] = zero
+                cuda.syncthreads()
+
+                if i < n:
+                    for k in range(CUDA_TILE):
+                        j = tile + k
+                        if j < n and j != i:
+                            dx = sx[k] - xi
+                            dy = sy[k] - yi
+                            dz = sz[k] - zi
+
+                            if wrap_size_f > zero:
+                                dx -= wrap_size_f * math.floor(dx / wrap_size_f + half)
+                                dy -= wrap_size_f * math.floor(dy / wrap_size_f + half)
+                                dz -= wrap_size_f * math.floor(dz / wrap_size_f + half)
+
+                            d2 = dx * dx + dy * dy + dz * dz
+
+                            # Blobs at the same spot pull in no direction
+                            if d2 < range2_f and d2 > zero:
+                                f = g_f * sm[k] / (d2 * math.sqrt(d2))
+                                ax += dx * f
+                                ay += dy * f
+                                az += dz * f
+                cuda.syncthreads()
+
+            if i < n:
+                acc[i, 0] = ax
+                acc[i, 1] = ay
+                acc[i, 2] = az
+
+        return _cuda_gravity_kernel
+
+    # One kernel per precision, picked by the positions' dtype (see use_float32)
+    CUDA_GRAVITY_KERNELS: dict = {
+        np.dtype(np.float32): _make_cuda_gravity_kernel(numba.float32),
+        np.dtype(np.float64): _make_cuda_gravity_kernel(numba.float64),
+    }
+
+
+class BlobKernels:
+    """
+    A static class used to provide the array based physics kernels for BlobPlotter. Every method works on the
+    (N,3) position and (N,) mass/radius arrays held by BlobPlotter. If Numba is installed the heavy lifting is
+    JIT compiled (or run on the GPU if there is a CUDA device and enough blobs), otherwise it falls back to plain NumPy
+
+    Attributes
+    ----------
+    use_numba : bool = NUMBA_AVAILABLE - Whether the Numba kernels are used (can be switched off to compare)
+    use_cuda : bool = CUDA_AVAILABLE - Whether gravity is calculated on the GPU once there are CUDA_MIN_BLOBS blobs
+    use_barnes_hut : bool = True - Whether gravity is approximated with BlobOctree once there are more than
+                                   BARNES_HUT_MIN_BLOBS blobs (Numba only, and not when the universe wraps)
+    use_float32 : bool = True - Whether accelerations are calculated in single precision (positions and
+                                velocities stay float64, only the force kernel is float32)
+
+    Methods
+    -------
+    separations(pos: npt.NDArray, wrap_size: float) -> npt.NDArray
+        Returns the (N,N,3) array of separations, r[i, j] points from blob i to blob j
+
+    accelerations(pos: npt.NDArray, mass: npt.NDArray, g: float, gravitational_range: float, wrap_size: float = 0.0) -> npt.NDArray
+        Returns the (N,3) gravitational acceleration of every blob caused by every other blob within gravitational_range
+
+    float32_inputs(pos: npt.NDArray, mass: npt.NDArray, g: float, gravitational_range: float, wrap_size: float = 0.0) -> Tuple
+        Returns the inputs converted for the float32 kernels (AU relative to the center blob, g folded into the masses)
+
+    direct_sum(num_blobs: int, wrap_size: float = 0.0) -> bool
+        Returns whether the Numba kernels sum every pair directly (rather than handing off to CUDA or BlobOctree)
+
+    step(pos: npt.NDArray, vel: npt.NDArray, prev_pos: npt.NDArray, mass: npt.NDArray, g: float, gravitational_range: float, timescale: float, wrap_size: float = 0.0) -> None
+        Kicks vel by gravity and drifts pos by the new vel in place, in one fused pass with Numba
+
+    cuda_accelerations(pos: npt.NDArray, mass: npt.NDArray, g: float, gravitational_range: float, wrap_size: float = 0.0) -> npt.NDArray
+        Same as accelerations(), but always calculated on the GPU (only call if CUDA_AVAILABLE)
+
+    touching_pairs(pos: npt.NDArray, radius: npt.NDArray, wrap_size: float = 0.0) -> Tuple[npt.NDArray, npt.NDArray]
+        Returns the index pairs (i < j) of blobs that are touching each other, and the distance between each pair
+        (found with a uniform grid broadphase, Numba compiled if available)
+
+    grid_touching_pairs(pos: npt.NDArray, radius: npt.NDArray, cell_size: float, wrap_cells: int = 0, wrap_size: float = 0.0) -> Tuple[npt.NDArray, npt.NDArray]
+        NumPy version of the uniform grid broadphase used by touching_pairs()
+    """
+
+    use_numba: bool = NUMBA_AVAILABLE
+    use_cuda: bool = CUDA_AVAILABLE
+    use_barnes_hut: bool = True
+    use_float32: bool = True
+
+    @staticmethod
+    def separations(pos: npt.NDArray, wrap_size: float = 0.0) -> npt.NDArray:
+        """Returns the (N,N,3) array of separations, r[i, j] points from blob i to blob j"""
+        r: npt.NDArray = pos[np.newaxis, :, :] - pos[:, np.newaxis, :]
+
+        if wrap_size > 0.0:
+            # Blobs on opposite edges of a wrapping universe are neighbours
+            r -= wrap_size * np.round(r / wrap_size)
+
+        return r
+
+    @staticmethod
+    def accelerations(
+        pos: npt.NDArray,
+        mass: npt.NDArray,
+        g: float,
+        gravitational_range: float,
+        wrap_size: float = 0.0,
+    ) -> npt.NDArray:
+        """
+        Returns the (N,3) gravitational acceleration of every blob caused by every other blob within gravitational_range,
+        a_i = g * sum_j(m_j * r_ij / d_ij^3). Large numbers of blobs are handed to the GPU or BlobOctree instead
+        """
+        if BlobKernels.use_float32 and pos.dtype != np.float32:
+            return BlobKernels.accelerations(
+                *BlobKernels.float32_inputs(pos, mass, g, gravitational_range, wrap_size)
+            ).astype(np.float64)
+
+        if BlobKernels.use_cuda and len(pos) >= CUDA_MIN_BLOBS:
+            return BlobKernels.cuda_accelerations(
+                pos, mass, g, gravitational_range, wrap_size
+            )
+
+        if BlobKernels.use_numba:
+            if not BlobKernels.direct_sum(len(pos), wrap_size):
+                return BlobOctree.accelerations(pos, mass, g, gravitational_range)
+
+            acc: npt.NDArray = np.empty_like(pos)
+            _compute_accelerations(pos, mass, g, gravitational_range, wrap_size, acc)
+            return acc
+
+        # One contiguous (N,N) plane per axis rather than an (N,N,3) array, and sqrt/reciprocal rather than
+        # pow, so every step is a plain SIMD ufunc loop (in float32 too, see use_float32)
+        axes: list[npt.NDArray] = []
+        for k in range(3):
+            dk: npt.NDArray = pos[np.newaxis, :, k] - pos[:, np.newaxis, k]
+            if wrap_size > 0.0:
+                # Blobs on opposite edges of a wrapping universe are neighbours
+                dk -= wrap_size * np.round(dk / wrap_size)
+            axes.append(dk)
+
+        dx, dy, dz = axes
+        d2: npt.NDArray = dx * dx
+        d2 += dy * dy
+        d2 += dz * dz
+        np.fill_diagonal(d2, np.inf)
+        d2[d2 >= gravitational_range * gravitational_range] = np.inf
+        # Blobs at the same spot pull in no direction (the kernels' d2 > 0 guard)
+        d2[d2 <= 0] = np.inf
+
+        # m_j / d_ij^3, 0 for itself and out of range blobs
+        inv_d3: npt.NDArray = np.sqrt(d2)
+        inv_d3 *= d2
+        np.reciprocal(inv_d3, out=inv_d3)
+        inv_d3 *= mass
+
+        acc: npt.NDArray = np.empty_like(pos)
+        for k in range(3):
+            acc[:, k] = np.einsum("ij,ij->i", inv_d3, axes[k])
+
+        return g * acc
+
+    @staticmethod
+    def float32_inputs(
+        pos: npt.NDArray,
+        mass: npt.NDArray,
+        g: float,
+        gravitational_range: float,
+        wrap_size: float = 0.0,
+    ) -> Tuple[npt.NDArray, npt.NDArray, float, float, float]:
+        """
+        Returns (pos, mass, g, gravitational_range, wrap_size) converted for the float32 kernels. The cube of a
+        distance in meters overflows float32, so they work in AU relative to the center blob, with g folded into
+        the masses (so accelerations still come back in m/s^2)
+        """
+        return (
+            ((pos - pos[0]) / AU).astype(np.float32),
+            (mass * (g / AU**2)).astype(np.float32),
+            1.0,
+            gravitational_range / AU,
+            wrap_size / AU,
+        )
+
+    @staticmethod
+    def direct_sum(num_blobs: int, wrap_size: float = 0.0) -> bool:
+        """Returns whether the Numba kernels sum every pair directly (rather than handing off to CUDA or BlobOctree)"""
+        if BlobKernels.use_cuda and num_blobs >= CUDA_MIN_BLOBS:
+            return False
+
+        return not (
+            BlobKernels.use_barnes_hut
+            and wrap_size == 0.0
+            and num_blobs > BARNES_HUT_MIN_BLOBS
+        )
+
+    @staticmethod
+    def step(
+        pos: npt.NDArray,
+        vel: npt.NDArray,
+        prev_pos: npt.NDArray,
+        mass: npt.NDArray,
+        g: float,
+        gravitational_range: float,
+        timescale: float,
+        wrap_size: float = 0.0,
+    ) -> None:
+        """
+        Kicks vel by the gravitational acceleration and drifts pos by the new vel (saving the old one in prev_pos),
+        all in place. With Numba this is one fused pass over the blobs
+        """
+        if BlobKernels.use_numba and BlobKernels.direct_sum(len(pos), wrap_size):
+            kernel_inputs: Tuple = (pos, mass, g, gravitational_range, wrap_size)
+            if BlobKernels.use_float32:
+                kernel_inputs = BlobKernels.float32_inputs(*kernel_inputs)
+
+            _compute_step(*kernel_inputs, timescale, pos, vel, prev_pos)
+            return
+
+        vel += (
+            BlobKernels.accelerations(pos, mass, g, gravitational_range, wrap_size)
+            * timescale
+        )
+        prev_pos[:] = pos
+        pos += vel * timescale
+
+    @staticmethod
+    def cuda_accelerations(
+        pos: npt.NDArray,
+        mass: npt.NDArray,
+        g: float,
+        gravitational_range: float,
+        wrap_size: float = 0.0,
+    ) -> npt.NDArray:
+        """Same as accelerations(), but always calculated on the GPU (only call if CUDA_AVAILABLE)"""
+        d_pos = cuda.to_device(np.ascontiguousarray(pos))
+        d_mass = cuda.to_device(np.ascontiguousarray(mass))
+        d_acc = cuda.device_array_like(d_pos)
+
+        blocks: int = (len(pos) + CUDA_TILE - 1) // CUDA_TILE
+        CUDA_GRAVITY_KERNELS[pos.dtype][blocks, CUDA_TILE](
+            d_pos,
+            d_mass,
+            g,
+            gravitational_range * gravitational_range,
+            wrap_size,
+            d_acc,
+        )
+
+        return d_acc.copy_to_host()
+
+    @staticmethod
+    def touching_pairs(
+        pos: npt.NDArray, radius: npt.NDArray, wrap_size: float = 0.0
+    ) -> Tuple[npt.NDArray, npt.NDArray]:
+        """
+        Returns the index pairs (i < j) of blobs that are touching each other, and the distance between each pair.
+        Pairs are sorted by i then j, so collisions are always resolved in the same order
+        """
+        if len(pos) > 2:
+            # Two touching blobs (other than the center blob) are never further apart than this
+            cell_size: float = 2.0 * float(radius[1:].max())
+            wrap_cells: int = 0
+
+            if wrap_size > 0.0:
+                # Whole number of cells across the universe, so the grid wraps with it
+                wrap_cells = int(wrap_size // cell_size) if cell_size > 0.0 else 0
+                if wrap_cells >= 3:
+                    cell_size = wrap_size / wrap_cells
+
+            if cell_size > 0.0 and (wrap_size == 0.0 or wrap_cells >= 3):
+                if BlobKernels.use_numba:
+                    pairs, d = _touching_pairs(
+                        pos, radius, cell_size, wrap_cells, wrap_size
+                    )
+                else:
+                    pairs, d = BlobKernels.grid_touching_pairs(
+                        pos, radius, cell_size, wrap_cells, wrap_size
+                    )
+                sort: npt.NDArray = np.lexsort((pairs[:, 1], pairs[:, 0]))
+                return pairs[sort], d[sort]
+
+        r: npt.NDArray = BlobKernels.separations(pos, wrap_size)
+        d2: npt.NDArray = np.einsum("ijk,ijk->ij", r, r)
+        touch: npt.NDArray = radius[:, np.newaxis] + radius[np.newaxis, :]
+
+        i, j = np.nonzero(np.triu(d2 <= touch * touch, 1))
+
+        return np.stack((i, j), axis=1), np.sqrt(d2[i, j])
+
+    @staticmethod
+    def grid_touching_pairs(
+        pos: npt.NDArray,
+        radius: npt.NDArray,
+        cell_size: float,
+        wrap_cells: int = 0,
+        wrap_size: float = 0.0,
+    ) -> Tuple[npt.NDArray, npt.NDArray]:
+        """
+        NumPy version of the Numba uniform grid broadphase used by touching_pairs() (unsorted pairs). Blobs 1..N-1
+        are binned into cells of cell_size, sorted by cell, and each of the 27 neighbouring cells is looked up for
+        every blob at once with searchsorted(). Blob 0 (the center blob) is checked against every blob
+        """
+        n: int = len(pos)
+        others: npt.NDArray = np.arange(1, n)
+
+        # Cell of every blob, relative to the lowest corner when the universe doesn't wrap
+        if wrap_cells > 0:
+            cells: npt.NDArray = np.floor(pos[1:] / cell_size).astype(np.int64)
+            cells %= wrap_cells
+            dims: npt.NDArray = np.full(3, wrap_cells, dtype=np.int64)
+        else:
+            cells = np.floor((pos[1:] - pos[1:].min(axis=0)) / cell_size).astype(
+                np.int64
+            )
+            dims = cells.max(axis=0) + 1
+
+        keys: npt.NDArray = (cells[:, 0] * dims[1] + cells[:, 1]) * dims[
+            2
+        ] + cells[:, 2]
+        order: npt.NDArray = np.argsort(keys)
+        sorted_keys: npt.NDArray = keys[order]
+        sorted_blobs: npt.NDArray = others[order]
+
+        # The center blob against everything
+        i_parts: list[npt.NDArray] = [np.zeros(n - 1, dtype=np.int64)]
+        j_parts: list[npt.NDArray] = [others]
+
+        for o in range(27):
+            neighbour: npt.NDArray = cells + np.array(
+                [(o % 3) - 1, ((o // 3) % 3) - 1, (o // 9) - 1]
+            )
+            valid: npt.NDArray
+            if wrap_cells > 0:
+                neighbour %= wrap_cells
+                valid = np.ones(n - 1, dtype=bool)
+            else:
+                valid = np.all((neighbour >= 0) & (neighbour < dims), axis=1)
+
+            neighbour_keys: npt.NDArray = (
+                neighbour[:, 0] * dims[1] + neighbour[:, 1]
+            ) * dims[2] + neighbour[:, 2]
+            start: npt.NDArray = np.searchsorted(sorted_keys, neighbour_keys, "left")
+            count: npt.NDArray = (
+                np.searchsorted(sorted_keys, neighbour_keys, "right") - start
+            )
+            count[~valid] = 0
+
+            # Every (blob, blob in neighbouring cell) candidate, flattened
+            total: int = int(count.sum())
+            if total == 0:
+                continue
+            first: npt.NDArray = np.repeat(np.cumsum(count) - count, count)
+            i: npt.NDArray = np.repeat(others, count)
+            j: npt.NDArray = sorted_blobs[
+                np.repeat(start, count) + (np.arange(total) - first)
+            ]
+
+            keep: npt.NDArray = j > i
+            i_parts.append(i[keep])
+            j_parts.append(j[keep])
+
+        i = np.concatenate(i_parts)
+        j = np.concatenate(j_parts)
+
+        r: npt.NDArray = pos[j] - pos[i]
+        if wrap_size > 0.0:
+            r -= wrap_size * np.round(r / wrap_size)
+        d2: npt.NDArray = np.einsum("ij,ij->i", r, r)
+        touch: npt.NDArray = radius[i] + radius[j]
+
+        # Squared distances are compared, only the pairs that touch need a square root
+        touching: npt.NDArray = d2 <= touch * touch
+
+        return np.stack((i[touching], j[touching]), axis=1), np.sqrt(d2[touching])
@@ -0,0 +1,388 @@
+"""
+Newton's Laws, a simulator of physics at the scale of space
+
+A static class used to approximate gravity with a Barnes-Hut octree (O(N log N) instead of O(N^2))
+
+by Jason Mott, copyright 2024
+"""
+
+import math
+from typing import Any, Callable, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+from .globals import *
+
+try:
+    from numba import njit, prange
+
+    NUMBA_AVAILABLE: bool = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args: Any, **kwargs: Any) -> Callable:
+        """Stand in for numba.njit so the tree code still runs (slowly) as plain Python"""
+        return lambda func: func
+
+
+__author__ = "Jason Mott"
+__copyright__ = "Copyright 2024"
+__license__ = "GPL 3.0"
+__version__ = VERSION
+__maintainer__ = "Jason Mott"
+__email__ = "github@jasonmott.com"
+__status__ = "In Progress"
+
+
+# Cells stop splitting at this depth, blobs closer than root size / 2^MAX_DEPTH share a cell
+MAX_DEPTH: int = 48
+
+# Bits per axis of a Morton code (3 * 21 = 63, so a code fits in a uint64)
+MORTON_BITS: int = 21
+
+# fastmath without the no-nan/no-inf assumptions, so the kernels' guards against a zero distance
+# (and the blob's pull on itself) can't be optimized away
+FASTMATH: set = {"nsz", "arcp", "contract", "afn", "reassoc"}
+
+
+@njit(cache=True)
+def _octant(pos: npt.NDArray, b: int, center: npt.NDArray, node: int) -> int:
+    """Returns which of the 8 children of node the blob at index b belongs in"""
+    o = 0
+    if pos[b, 0] >= center[node, 0]:
+        o |= 1
+    if pos[b, 1] >= center[node, 1]:
+        o |= 2
+    if pos[b, 2] >= center[node, 2]:
+        o |= 4
+    return o
+
+
+@njit(cache=True)
+def _build_tree(pos: npt.NDArray, mass: npt.NDArray, capacity: int) -> Tuple:
+    """
+    Inserts every blob into an octree held in flat arrays (one row per node). Returns a node count of -1 if
+    capacity was too small, the caller should try again with a bigger one
+    """
+    n = pos.shape[0]
+
+    center = np.empty((capacity, 3), dtype=np.float64)
+    half = np.empty(capacity, dtype=np.float64)
+    depth = np.zeros(capacity, dtype=np.int64)
+    child = np.full((capacity, 8), -1, dtype=np.int64)
+    first = np.full(capacity, -1, dtype=np.int64)
+    internal = np.zeros(capacity, dtype=np.bool_)
+    body_next = np.full(n, -1, dtype=np.int64)
+
+    # Root cell is the cube around all the blobs
+    lo = pos[0].copy()
+    hi = pos[0].copy()
+    for b in range(1, n):
+        for k in range(3):
+            lo[k] = min(lo[k], pos[b, k])
+            hi[k] = max(hi[k], pos[b, k])
+
+    size = 0.0
+    for k in range(3):
+        center[0, k] = (lo[k] + hi[k]) / 2
+        size = max(size, hi[k] - lo[k])
+    # Padding is relative only, the tree gets meters or AU (see BlobKernels.float32_inputs())
+    half[0] = max(size, 1e-300) * 0.5 * 1.0001
+
+    count = 1
+
+    for b in range(n):
+        node = 0
+        while True:
+            if internal[node]:
+                o = _octant(pos, b, center, node)
+                c = child[node, o]
+                if c >= 0:
+                    node = c
+                    continue
+
+                if count == capacity:
+                    return -1, center, half, child, first, internal, body_next
+                c = count
+                count += 1
+                h = half[node] / 2
+                center[c, 0] = center[node, 0] + (h if o & 1 else -h)
+                center[c, 1] = center[node, 1] + (h if o & 2 else -h)
+                center[c, 2] = center[node, 2] + (h if o & 4 else -h)
+                half[c] = h
+                depth[c] = depth[node] + 1
+                first[c] = b
+                child[node, o] = c
+                break
+
+            elif first[node] < 0:
+                first[node] = b
+                break
+
+            elif depth[node] >= MAX_DEPTH:
+                body_next[b] = first[node]
+                first[node] = b
+                break
+
+            else:
+                # Leaf already has a blob, push it down a level and try again
+                e = first[node]
+                o = _octant(pos, e, center, node)
+
+                if count == capacity:
+                    return -1, center, half, child, first, internal, body_next
+                c = count
+                count += 1
+                h = half[node] / 2
+                center[c, 0] = center[node, 0] + (h if o & 1 else -h)
+                center[c, 1] = center[node, 1] + (h if o & 2 else -h)
+                center[c, 2] = center[node, 2] + (h if o & 4 else -h)
+                half[c] = h
+                depth[c] = depth[node] + 1
+                first[c] = e
+                child[node, o] = c
+
+                first[node] = -1
+                internal[node] = True
+
+    return count, center, half, child, first, internal, body_next
+
+
+@njit(cache=True)
+def _tree_moments(
+    pos: npt.NDArray,
+    mass: npt.NDArray,
+    count: int,
+    child: npt.NDArray,
+    first: npt.NDArray,
+    internal: npt.NDArray,
+    body_next: npt.NDArray,
+) -> Tuple[npt.NDArray, npt.NDArray]:
+    """Returns the center of mass and total mass of every node"""
+    com = np.zeros((count, 3), dtype=np.float64)
+    node_mass = np.zeros(count, dtype=np.float64)
+
+    # Children are always created after their parent, so walking backwards sees them first
+    for k in range(count - 1, -1, -1):
+        if internal[k]:
+            for o in range(8):
+                c = child[k, o]
+                if c >= 0:
+                    node_mass[k] += node_mass[c]
+                    com[k, 0] += com[c, 0] * node_mass[c]
+                    com[k, 1] += com[c, 1] * node_mass[c]
+                    com[k, 2] += com[c, 2] * node_mass[c]
+        else:
+            b = first[k]
+            while b >= 0:
+                node_mass[k] += mass[b]
+                com[k, 0] += pos[b, 0] * mass[b]
+                com[k, 1] += pos[b, 1] * mass[b]
+                com[k, 2] += pos[b, 2] * mass[b]
+                b = body_next[b]
+
+        if node_mass[k] > 0:
+            com[k, 0] /= node_mass[k]
+            com[k, 1] /= node_mass[k]
+            com[k, 2] /= node_mass[k]
+
+    return com, node_mass
+
+
+@njit(parallel=True, fastmath=FASTMATH, cache=True)
+def _tree_accelerations(
+    pos: npt.NDArray,
+    mass: npt.NDArray,
+    g: float,
+    gravitational_range: float,
+    theta: float,
+    half: npt.NDArray,
+    child: npt.NDArray,
+    first: npt.NDArray,
+    internal: npt.NDArray,
+    body_next: npt.NDArray,
+    com: npt.NDArray,
+    node_mass: npt.NDArray,
+    acc: npt.NDArray,
+) -> None:
+    """Walks the tree once per blob (stack based, no recursion), one i blob per thread"""
+    n = pos.shape[0]
+    range2 = gravitational_range * gravitational_range
+    theta2 = theta * theta
+
+    for i in prange(n):
+        xi = pos[i, 0]
+        yi = pos[i, 1]
+        zi = pos[i, 2]
+        ax = 0.0
+        ay = 0.0
+        az = 0.0
+
+        stack = np.empty(8 * (MAX_DEPTH + 1), dtype=np.int64)
+        stack[0] = 0
+        top = 1
+
+        while top > 0:
+            top -= 1
+            k = stack[top]
+
+            if internal[k]:
+                dx = com[k, 0] - xi
+                dy = com[k, 1] - yi
+                dz = com[k, 2] - zi
+                d2 = dx * dx + dy * dy + dz * dz
+                size = 2 * half[k]
+
+                if size * size < theta2 * d2:
+                    # Far enough away, the whole cell pulls like one blob at its center of mass
+                    if d2 < range2:
+                        f = g * node_mass[k] / (d2 * math.sqrt(d2))
+                        ax += dx * f
+                        ay += dy * f
+                        az += dz * f
+                else:
+                    for o in range(8):
+                        c = child[k, o]
+                        if c >= 0:
+                            stack[top] = c
+                            top += 1
+            else:
+                b = first[k]
+                while b >= 0:
+                    if b != i:
+                        dx = pos[b, 0] - xi
+                        dy = pos[b, 1] - yi
+                        dz = pos[b, 2] - zi
+                        d2 = dx * dx + dy * dy + dz * dz
+                        # Blobs at the same spot have no direction between them, so no pull
+                        if d2 < range2 and d2 > 0.0:
+                            f = g * mass[b] / (d2 * math.sqrt(d2))
+                            ax += dx * f
+                            ay += dy * f
+                            az += dz * f
+                    b = body_next[b]
+
+        acc[i, 0] = ax
+        acc[i, 1] = ay
+        acc[i, 2] = az
+
+
+class BlobOctree:
+    """
+    A static class used to approximate gravity with a Barnes-Hut octree (O(N log N) instead of O(N^2)).
+    The tree is rebuilt from the BlobPlotter state arrays every step and is kept in flat arrays, one row
+    per node, so it can be built and walked by Numba compiled code
+
+    Attributes
+    ----------
+    available : bool = NUMBA_AVAILABLE - Whether the tree code is compiled (it runs as slow plain Python otherwise)
+
+    Methods
+    -------
+    build_tree(pos: npt.NDArray, mass: npt.NDArray) -> Tuple
+        Builds the octree for the provided blobs, returns (half_size, child, first, internal, body_next, com, node_mass)
+
+    morton_order(pos: npt.NDArray) -> npt.NDArray
+        Returns the indices that sort the blobs by Morton (Z-order) code, so blobs that are near each other in space
+        end up near each other in memory
+
+    accelerations(pos: npt.NDArray, mass: npt.NDArray, g: float, gravitational_range: float, theta: float = BARNES_HUT_THETA) -> npt.NDArray
+        Returns the (N,3) gravitational acceleration of every blob, using a cell's center of mass in place of its blobs
+        when cell size / distance < theta
+    """
+
+    available: bool = NUMBA_AVAILABLE
+
+    @staticmethod
+    def build_tree(pos: npt.NDArray, mass: npt.NDArray) -> Tuple:
+        """
+        Builds the octree for the provided blobs, returns (half_size, child, first, internal, body_next, com, node_mass)
+        """
+        capacity: int = 2 * len(pos) + 64
+
+        while True:
+            count, _, half, child, first, internal, body_next = _build_tree(
+                pos, mass, capacity
+            )
+            if count > 0:
+                break
+            capacity *= 2
+
+        com, node_mass = _tree_moments(
+            pos, mass, count, child, first, internal, body_next
+        )
+
+        return (
+            half[:count],
+            child[:count],
+            first[:count],
+            internal[:count],
+            body_next,
+            com,
+            node_mass,
+        )
+
+    @staticmethod
+    def morton_order(pos: npt.NDArray) -> npt.NDArray:
+        """
+        Returns the indices that sort the blobs by Morton (Z-order) code, so blobs that are near each other in space
+        end up near each other in memory
+        """
+        lo: npt.NDArray = pos.min(axis=0)
+        span: float = float((pos.max(axis=0) - lo).max()) or 1.0
+        cells: npt.NDArray = (
+            (pos - lo) * (((1 << MORTON_BITS) - 1) / span)
+        ).astype(np.uint64)
+
+        # Spread each axis' bits out to every third bit, then interleave the three axes
+        masks: Tuple[int, ...] = (
+            0x1F00000000FFFF,
+            0x1F0000FF0000FF,
+            0x100F00F00F00F00F,
+            0x10C30C30C30C30C3,
+            0x1249249249249249,
+        )
+        for shift, mask in zip((32, 16, 8, 4, 2), masks):
+            cells = (cells | (cells << np.uint64(shift))) & np.uint64(mask)
+
+        codes: npt.NDArray = (
+            cells[:, 0] | (cells[:, 1] << np.uint64(1)) | (cells[:, 2] << np.uint64(2))
+        )
+
+        return np.argsort(codes)
+
+    @staticmethod
+    def accelerations(
+        pos: npt.NDArray,
+        mass: npt.NDArray,
+        g: float,
+        gravitational_range: float,
+        theta: float = BARNES_HUT_THETA,
+    ) -> npt.NDArray:
+        """
+        Returns the (N,3) gravitational acceleration of every blob, using a cell's center of mass in place of its blobs
+        when cell size / distance < theta
+        """
+        # Blobs are handed to the tree in Morton order, so each insert and each walk mostly follows the
+        # same nodes as the one before it (and the threads' blobs are close together), which keeps them in cache
+        order: npt.NDArray = BlobOctree.morton_order(pos)
+        sorted_pos: npt.NDArray = np.ascontiguousarray(pos[order])
+        sorted_mass: npt.NDArray = np.ascontiguousarray(mass[order])
+        sorted_acc: npt.NDArray = np.empty_like(sorted_pos)
+
+        _tree_accelerations(
+            sorted_pos,
+            sorted_mass,
+            g,
+            gravitational_range,
+            theta,
+            *BlobOctree.build_tree(sorted_pos, sorted_mass),
+            sorted_acc,
+        )
+
+        acc: npt.NDArray = np.empty_like(pos)
+        acc[order] = sorted_acc
+
+        return acc
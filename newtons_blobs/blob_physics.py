@@ -39,7 +39,7 @@ class distance:
         self.dx: float = point1.x - point2.x
         self.dy: float = point1.y - point2.y
         self.dz: float = point1.z - point2.z
-        self.d: float = math.sqrt((self.dx**2 + self.dy**2 + self.dz**2))
+        self.d: float = math.hypot(self.dx, self.dy, self.dz)
 
 
 class position_marker:
@@ -68,6 +68,8 @@ class BlobPhysics:
 
     COR : float = 0.5 - Coefficient of restitution used to make blob collisions inelastic
 
+    EDGE_VELOCITY_LOSS : float = 0.75 - Fraction of velocity a blob keeps when it bounces off (or wraps past) an edge
+
     Methods
     -------
     set_gravitational_range(scaled_universe_height: float) -> None
@@ -78,6 +80,12 @@ class BlobPhysics:
         Checks to see if blob is hitting the edge of the screen, and reverses velocity if so
         or it wraps to other end of screen if wrap==True (wrap currently not working)
 
+    bounce_edges(pos: npt.NDArray, vel: npt.NDArray, radius: npt.NDArray, universe_size: float) -> None
+        Same as edge_detection() (without wrap), but for every blob at once on the (N,3) state arrays, in place
+
+    wrap_edges(pos: npt.NDArray, vel: npt.NDArray, universe_size: float) -> None
+        Same as edge_detection() (with wrap), but for every blob at once on the (N,3) state arrays, in place
+
     new_radius(r1: float, r2: float) -> float
         Calculates and returns a new radius based on the combined volumes of
         two spheres with the provided radii (i.e., when two blobs combine,
@@ -110,6 +118,8 @@ class BlobPhysics:
     # coefficient of restitution
     COR: float = 0.5
 
+    EDGE_VELOCITY_LOSS: float = 0.75
+
     @classmethod
     def set_gravitational_range(cls, scaled_universe_height: float) -> None:
         """
@@ -124,7 +134,7 @@ class BlobPhysics:
         Checks to see if blob is hitting the edge of the screen, and reverses velocity if so
         or it wraps to other end of screen if wrap==True (wrap currently not working)
         """
-        velocity_loss = 0.75
+        velocity_loss = BlobPhysics.EDGE_VELOCITY_LOSS
 
         if bg_vars.wrap_if_no_escape:
             # Move real x to other side of screen if it's gone off the edge
@@ -208,6 +218,42 @@ class BlobPhysics:
                 blob.z = scaled_universe_size_h - blob.scaled_radius
                 blob.vz = blob.vz * velocity_loss
 
+    @staticmethod
+    def bounce_edges(
+        pos: npt.NDArray, vel: npt.NDArray, radius: npt.NDArray, universe_size: float
+    ) -> None:
+        """
+        Same as edge_detection() (without wrap), but for every blob at once on the (N,3) state arrays, in place.
+        radius and universe_size are in real (scaled up) units
+        """
+        r: npt.NDArray = np.broadcast_to(radius[:, np.newaxis], pos.shape)
+
+        # Low edges first, then high edges, same order as edge_detection()
+        hit: npt.NDArray = (pos - r <= 0) & (vel <= 0)
+        vel[hit] *= -BlobPhysics.EDGE_VELOCITY_LOSS
+        pos[hit] = r[hit]
+
+        hit = (pos + r >= universe_size) & (vel >= 0)
+        vel[hit] *= -BlobPhysics.EDGE_VELOCITY_LOSS
+        pos[hit] = universe_size - r[hit]
+
+    @staticmethod
+    def wrap_edges(pos: npt.NDArray, vel: npt.NDArray, universe_size: float) -> None:
+        """
+        Same as edge_detection() (with wrap), but for every blob at once on the (N,3) state arrays, in place.
+        universe_size is in real (scaled up) units
+        """
+        # Axes are done in turn, since wrapping on one axis flips velocity on the other two
+        for k in range(3):
+            low: npt.NDArray = (vel[:, k] < 0) & (pos[:, k] < 0)
+            high: npt.NDArray = (vel[:, k] > 0) & (pos[:, k] > universe_size)
+            hit: npt.NDArray = low | high
+
+            pos[low, k] += universe_size
+            pos[high, k] -= universe_size
+            vel[hit] *= -1
+            vel[hit, k] *= -BlobPhysics.EDGE_VELOCITY_LOSS
+
     @staticmethod
     def new_radius(r1: float, r2: float) -> float:
         """
@@ -215,9 +261,8 @@ class BlobPhysics:
         two spheres with the provided radii (i.e., when two blobs combine,
         this is their new radius)
         """
-        v1 = (4 / 3) * math.pi * (r1**3)
-        v2 = (4 / 3) * math.pi * (r2**3)
-        return math.cbrt(((v1 + v2) * 3) / (4 * math.pi))
+        # The (4 / 3) * pi of each volume cancels out with the one in the cube root
+        return math.cbrt((r1**3) + (r2**3))
 
     @staticmethod
     def collision_detection(
@@ -228,20 +273,59 @@ class BlobPhysics:
         according to Newton's Laws
         """
         dd: float = blob1.orig_radius[0] + blob2.orig_radius[0]
-        if abs(blob2.x - blob1.x) > dd:
-            return
 
+        # A provided d is already the (minimum image) distance, see BlobKernels.touching_pairs()
         if d == 0:
             dx = blob2.x - blob1.x
             dy = blob2.y - blob1.y
             dz = blob2.z - blob1.z
-            d = math.sqrt((dx**2) + (dy**2) + (dz**2))
+
+            if not bg_vars.center_blob_escape and bg_vars.wrap_if_no_escape:
+                # Blobs on opposite edges of a wrapping universe are neighbours
+                wrap_size = bg_vars.universe_size * bg_vars.scale_up
+                dx -= wrap_size * round(dx / wrap_size)
+                dy -= wrap_size * round(dy / wrap_size)
+                dz -= wrap_size * round(dz / wrap_size)
+
+            if abs(dx) > dd:
+                return
+
+            d = math.hypot(dx, dy, dz)
 
         diff: float = dd - d
 
         # Check if the two blobs are touching
         if d <= dd:
 
+            pvx1, pvy1, pvz1 = (blob1.pos - blob1.prev_pos) * bg_vars.scale_down
+            pvx2, pvy2, pvz2 = (blob2.pos - blob2.prev_pos) * bg_vars.scale_down
+
+            v1 = math.hypot(pvx1, pvy1, pvz1)
+            v2 = math.hypot(pvx2, pvy2, pvz2)
+            v_diff = round(abs(v2 - v1), 2)
+            b1_d_diff = round(((diff / 2) / blob1.orig_radius[0]) * 100)
+            b2_d_diff = round(((diff / 2) / blob2.orig_radius[0]) * 100)
+            d_ratio = round((d / dd) * 100)
+
+            if v_diff < 50 or b1_d_diff > 25 or b2_d_diff > 25:
+
+                if d_ratio < 30 or b1_d_diff > 100 or b2_d_diff > 100:
+                    smaller_blob = blob1
+                    larger_blob = blob2
+                    if smaller_blob.radius > larger_blob.radius:
+                        smaller_blob = blob2
+                        larger_blob = blob1
+                    larger_blob.mass += smaller_blob.mass * 0.95
+                    larger_blob.radius = BlobPhysics.new_radius(
+                        larger_blob.radius, smaller_blob.radius
+                    )
+                    smaller_blob.dead = True
+                    smaller_blob.swallowed = True
+                    smaller_blob.swallowed_by(larger_blob)
+
+                return
+
+            # Only blobs that bounce off each other need the new velocities
             ux1: float
             uy1: float
             uz1: float
@@ -252,62 +336,36 @@ class BlobPhysics:
             ux1, uy1, uz1 = blob1.vx, blob1.vy, blob1.vz
             ux2, uy2, uz2 = blob2.vx, blob2.vy, blob2.vz
 
-            cor_m1: float = BlobPhysics.COR * blob1.mass
-            cor_m2: float = BlobPhysics.COR * blob2.mass
+            # Masses are properties, read them once
+            m1: float = blob1.mass
+            m2: float = blob2.mass
+
+            cor_m1: float = BlobPhysics.COR * m1
+            cor_m2: float = BlobPhysics.COR * m2
 
-            m1_m2: float = blob1.mass + blob2.mass
+            m1_m2: float = m1 + m2
 
             # x reaction
 
-            px1_px2: float = (blob1.mass * ux1) + (blob2.mass * ux2)
+            px1_px2: float = (m1 * ux1) + (m2 * ux2)
 
             vx1: float = (cor_m2 * (ux2 - ux1) + (px1_px2)) / (m1_m2)
             vx2: float = (cor_m1 * (ux1 - ux2) + (px1_px2)) / (m1_m2)
 
             # y reaction
 
-            py1_py2: float = (blob1.mass * uy1) + (blob2.mass * uy2)
+            py1_py2: float = (m1 * uy1) + (m2 * uy2)
 
             vy1: float = (cor_m2 * (uy2 - uy1) + (py1_py2)) / (m1_m2)
             vy2: float = (cor_m1 * (uy1 - uy2) + (py1_py2)) / (m1_m2)
 
             # z reaction
 
-            pz1_pz2: float = (blob1.mass * uz1) + (blob2.mass * uz2)
+            pz1_pz2: float = (m1 * uz1) + (m2 * uz2)
 
             vz1: float = (cor_m2 * (uz2 - uz1) + (pz1_pz2)) / (m1_m2)
             vz2: float = (cor_m1 * (uz1 - uz2) + (pz1_pz2)) / (m1_m2)
 
-            # ------------------------------------------------#
-
-            pvx1, pvy1, pvz1 = blob1.pos_log[-1] - blob1.pos_log[-2]
-            pvx2, pvy2, pvz2 = blob2.pos_log[-1] - blob2.pos_log[-2]
-
-            v1 = math.sqrt((pvx1**2) + (pvy1**2) + (pvz1**2))
-            v2 = math.sqrt((pvx2**2) + (pvy2**2) + (pvz2**2))
-            v_diff = round(abs(v2 - v1), 2)
-            b1_d_diff = round(((diff / 2) / blob1.orig_radius[0]) * 100)
-            b2_d_diff = round(((diff / 2) / blob2.orig_radius[0]) * 100)
-            d_ratio = round((d / dd) * 100)
-
-            if v_diff < 50 or b1_d_diff > 25 or b2_d_diff > 25:
-
-                if d_ratio < 30 or b1_d_diff > 100 or b2_d_diff > 100:
-                    smaller_blob = blob1
-                    larger_blob = blob2
-                    if smaller_blob.radius > larger_blob.radius:
-                        smaller_blob = blob2
-                        larger_blob = blob1
-                    larger_blob.mass += smaller_blob.mass * 0.95
-                    larger_blob.radius = BlobPhysics.new_radius(
-                        larger_blob.radius, smaller_blob.radius
-                    )
-                    smaller_blob.dead = True
-                    smaller_blob.swallowed = True
-                    smaller_blob.swallowed_by(larger_blob)
-
-                return
-
             blob1.vx, blob1.vy, blob1.vz = vx1, vy1, vz1
             blob2.vx, blob2.vy, blob2.vz = vx2, vy2, vz2
 
@@ -330,25 +388,21 @@ class BlobPhysics:
         dy = blob1.y - blob2.y
         dz = blob1.z - blob2.z
         # dd = (blob1.orig_radius[0] * 0.90) + blob2.orig_radius[0]
-        d = math.sqrt((dx**2) + (dy**2) + (dz**2))
+        d = math.hypot(dx, dy, dz)
 
         if d < BlobPhysics.GRAVITATIONAL_RANGE:
-            F = BlobPhysics.g * blob1.mass * blob2.mass / d**2
-
-            theta = math.acos(dz / d)
-            phi = math.atan2(dy, dx)
-
-            fdx = F * math.sin(theta) * math.cos(phi)
-            fdy = F * math.sin(theta) * math.sin(phi)
-            fdz = F * math.cos(theta)
+            # G * m / d^2 along the unit vector (dx, dy, dz) / d, so no angles are needed
+            f = BlobPhysics.g * timescale / (d * d * d)
+            f1 = blob2.mass * f
+            f2 = blob1.mass * f
 
-            blob1.vx -= fdx / blob1.mass * timescale
-            blob1.vy -= fdy / blob1.mass * timescale
-            blob1.vz -= fdz / blob1.mass * timescale
+            blob1.vx -= dx * f1
+            blob1.vy -= dy * f1
+            blob1.vz -= dz * f1
 
-            blob2.vx += fdx / blob2.mass * timescale
-            blob2.vy += fdy / blob2.mass * timescale
-            blob2.vz += fdz / blob2.mass * timescale
+            blob2.vx += dx * f2
+            blob2.vy += dy * f2
+            blob2.vz += dz * f2
 
         elif bg_vars.center_blob_escape and blob1.name == CENTER_BLOB_NAME:
             # If out of Sun's gravitational range, kill it
@@ -372,8 +426,9 @@ class BlobPhysics:
 
             timescale: float = float(Decimal(bg_vars.timescale) * dt)
 
-            F1 = BlobPhysics.g * blob2.mass / d.d**3
-            F2 = BlobPhysics.g * blob1.mass / d.d**3
+            d3: float = d.d * d.d * d.d
+            F1 = BlobPhysics.g * blob2.mass / d3
+            F2 = BlobPhysics.g * blob1.mass / d3
 
             blob1.vx -= d.dx * F1 * timescale
             blob1.vy -= d.dy * F1 * timescale
@@ -421,7 +476,7 @@ class BlobPhysics:
 
             for i in range(0, num_steps):
 
-                F = GM / d.d**3
+                F = GM / (d.d * d.d * d.d)
 
                 F1 = F / blob1.mass
                 F2 = F / blob2.mass
@@ -6,7 +6,7 @@ Class file for setting up initial positions and velocities of blobs and maintain
 by Jason Mott, copyright 2024
 """
 
-from typing import Any, Callable, Dict, Tuple, Self
+from typing import Any, Dict, Self
 import numpy as np
 import numpy.typing as npt
 import math
@@ -18,6 +18,7 @@ from .blob_random import blob_random
 from .blob_plugin_factory import BlobPluginFactory
 from .massive_blob import MassiveBlob
 from .blob_physics import BlobPhysics as bp
+from .blob_kernels import BlobKernels as bk
 
 __author__ = "Jason Mott"
 __copyright__ = "Copyright 2024"
@@ -64,14 +65,26 @@ class BlobPlotter:
     plot_blobs() -> None
         Creates MassiveBlob instances and plots their initial x,y,z coordinates, all according to global constant preferences
 
-    draw_blobs() -> None
-        Iterates the blobs according z_axis keys, deletes the ones flagged as dead, calls draw() on the live ones, and repopulates
-        the proximity_grid array according to new coordinates
+    draw_blobs(redraw: bool = True) -> None
+        Calls draw() on every blob, furthest (highest z) first, so that nearer blobs are painted over further ones
+        (send False if nothing has changed since the last draw, only the graphics layer's grid check is done)
+
+    size_arrays(num_blobs: int) -> None
+        Points the state arrays at the first num_blobs rows of their buffers (only reallocating if there are more
+        blobs than the buffers can hold)
+
+    populate_arrays() -> None
+        (Re)fills the position, velocity, mass and radius arrays from self.blobs, and binds each blob to its row
+
+    populate_grid() -> None
+        Rebuilds the proximity_grid array according to the current blob coordinates (all blobs at once from self.pos)
+
+    remove_dead_blobs() -> None
+        Destroys the blobs flagged as dead and compacts self.blobs and the state arrays with a single boolean mask
 
     update_blobs() -> None
-        Traverses the proximity grid to check blobs for collision and gravitational pull, and populates the z_axis dict
-        The center blob is treated differently to ensure all blobs are checked against its gravitational pull rather than just
-        blobs within its proximity grid range
+        Checks all blobs for collision and gravitational pull against each other (vectorized over the state arrays),
+        advances them, deletes the ones flagged as dead, and repopulates the proximity grid
 
     plot_center_blob(universe: BlobUniverse) -> None
         Creates and places the center blob and adds it to self.blobs[0]
@@ -85,6 +98,10 @@ class BlobPlotter:
     add_pos_vel(blob: MassiveBlob, x: float, y: float, z: float) -> None
         Adds z,y,z to given blob, and configures velocity for orbit around center blob
 
+    add_pos_vels(blobs: list[MassiveBlob], positions: npt.NDArray) -> None
+        Adds the (N,3) positions to the given blobs, and configures their velocities (all at once) for orbit
+        around center blob
+
     """
 
     def __init__(
@@ -110,6 +127,20 @@ class BlobPlotter:
 
         # Preferences/states
         self.blobs: npt.NDArray = np.empty([NUM_BLOBS], dtype=MassiveBlob)
+
+        # Physics state of self.blobs, one row per blob (see populate_arrays()). The buffers are allocated
+        # once, self.pos etc. are views of their first len(self.blobs) rows (see size_arrays())
+        self.pos_buffer: npt.NDArray = np.zeros([NUM_BLOBS, 3], dtype=np.float64)
+        self.vel_buffer: npt.NDArray = np.zeros([NUM_BLOBS, 3], dtype=np.float64)
+        self.prev_pos_buffer: npt.NDArray = np.zeros([NUM_BLOBS, 3], dtype=np.float64)
+        self.mass_buffer: npt.NDArray = np.zeros([NUM_BLOBS], dtype=np.float64)
+        self.radius_buffer: npt.NDArray = np.zeros([NUM_BLOBS], dtype=np.float64)
+        self.pos: npt.NDArray = self.pos_buffer
+        self.vel: npt.NDArray = self.vel_buffer
+        self.prev_pos: npt.NDArray = self.prev_pos_buffer
+        self.mass: npt.NDArray = self.mass_buffer
+        self.radius: npt.NDArray = self.radius_buffer
+        self.z_order: npt.NDArray = np.arange(NUM_BLOBS)
         self.blobs_swallowed: int = 0
         self.blobs_escaped: int = 0
         self.proximity_grid: npt.NDArray = np.empty(
@@ -120,6 +151,8 @@ class BlobPlotter:
             ],
             dtype=MassiveBlob,
         )
+        # Flat indexes of the proximity_grid cells that have blobs in them (see populate_grid())
+        self.grid_cells: npt.NDArray = np.empty([0], dtype=np.int64)
         self.num_moons: int = (NUM_BLOBS - 1) - bg_vars.num_planets
         self.square_grid: bool = bg_vars.square_blob_plotter
         self.start_perfect_orbit: bool = bg_vars.start_perfect_orbit
@@ -200,6 +233,8 @@ class BlobPlotter:
                     )
 
         self.blobs = np.delete(self.blobs, np.where(self.blobs == None)[0])
+        self.populate_arrays()
+        self.populate_grid()
 
     def start_over(self: Self) -> None:
         """Clears all variables to initial state (i.e. deletes all blobs), and calls plot_blobs()"""
@@ -265,79 +300,76 @@ class BlobPlotter:
             bg_vars.min_moon_mass + bg_vars.max_moon_mass
         ) / 2
 
-        moon: bool = False
-
-        # Create orbiting blobs without position or velocity
-        for i in range(1, NUM_BLOBS):
-            # Set up some random values for this blob
-            color: int = round(blob_random.random() * (len(COLORS) - 1))
-            radius: float = 0.0
-            mass: float = 0.0
-
-            if i > self.num_moons:
-
-                moon = False
-
-                if blob_random.randint(1, 10) > 4:
-                    radius = round(
-                        (
-                            blob_random.random()
-                            * (radius_halfway_min_halfway - bg_vars.min_radius)
-                        )
-                        + bg_vars.min_radius,
-                        2,
-                    )
+        # Set up some random values for all the orbiting blobs at once
+        num_orbiting: int = NUM_BLOBS - 1
+        color: npt.NDArray = np.round(
+            blob_random.random_array(num_orbiting) * (len(COLORS) - 1)
+        ).astype(int)
+        radius_random: npt.NDArray = blob_random.random_array(num_orbiting)
+        mass_random: npt.NDArray = blob_random.random_array(num_orbiting)
+
+        # Blobs after the moons are planets, some small and some big
+        moon: npt.NDArray = np.arange(1, NUM_BLOBS) <= self.num_moons
+        small_planet: npt.NDArray = (
+            blob_random.randint_array(1, 10, num_orbiting) > 4
+        )
 
-                    mass = (
-                        blob_random.random()
-                        * (mass_halfway_min_halfway - bg_vars.min_mass)
-                        + bg_vars.min_mass
-                    )
-                else:
-                    radius = round(
-                        (
-                            blob_random.random()
-                            * (bg_vars.max_radius - radius_halfway_max_halfway)
-                        )
-                        + radius_halfway_max_halfway,
-                        2,
-                    )
+        radius: npt.NDArray = np.round(
+            np.where(
+                moon,
+                radius_random * (bg_vars.max_moon_radius - bg_vars.min_moon_radius)
+                + bg_vars.min_moon_radius,
+                np.where(
+                    small_planet,
+                    radius_random * (radius_halfway_min_halfway - bg_vars.min_radius)
+                    + bg_vars.min_radius,
+                    radius_random * (bg_vars.max_radius - radius_halfway_max_halfway)
+                    + radius_halfway_max_halfway,
+                ),
+            ),
+            2,
+        )
 
-                    mass = (
-                        blob_random.random()
-                        * (bg_vars.max_mass - mass_halfway_max_halfway)
-                    ) + mass_halfway_max_halfway
-            else:
-                moon = True
-                radius = round(
-                    (
-                        blob_random.random()
-                        * (bg_vars.max_moon_radius - bg_vars.min_moon_radius)
-                    )
-                    + bg_vars.min_moon_radius,
-                    2,
-                )
+        mass: npt.NDArray = np.where(
+            moon,
+            np.where(
+                radius > moon_radius_min_max_halfway,
+                mass_random * (bg_vars.max_moon_mass - moon_mass_min_max_halfway)
+                + moon_mass_min_max_halfway,
+                mass_random * (moon_mass_min_max_halfway - bg_vars.min_moon_mass)
+                + bg_vars.min_moon_mass,
+            ),
+            np.where(
+                small_planet,
+                mass_random * (mass_halfway_min_halfway - bg_vars.min_mass)
+                + bg_vars.min_mass,
+                mass_random * (bg_vars.max_mass - mass_halfway_max_halfway)
+                + mass_halfway_max_halfway,
+            ),
+        )
 
-                if radius > moon_radius_min_max_halfway:
-                    mass = (
-                        blob_random.random()
-                        * (bg_vars.max_moon_mass - moon_mass_min_max_halfway)
-                    ) + moon_mass_min_max_halfway
-                else:
-                    mass = (
-                        blob_random.random()
-                        * (moon_mass_min_max_halfway - bg_vars.min_moon_mass)
-                    ) + bg_vars.min_moon_mass
+        # Create orbiting blobs without position or velocity (loop invariants bound to locals, and the random
+        # values as plain floats/ints rather than NumPy scalars)
+        blobs: npt.NDArray = self.blobs
+        new_blob_surface = self.blob_factory.new_blob_surface
+        universe_size_h: float = self.universe_size_h
+
+        for i, blob_radius, blob_mass, blob_color, is_moon in zip(
+            range(1, NUM_BLOBS),
+            radius.tolist(),
+            mass.tolist(),
+            color.tolist(),
+            moon.tolist(),
+        ):
+            name: str = str(i)
 
             # Phew, let's instantiate this puppy . . .
-            self.blobs[i] = MassiveBlob(
-                self.universe_size_h,
+            blob: MassiveBlob = MassiveBlob(
+                universe_size_h,
                 i,
-                str(i),
-                self.blob_factory.new_blob_surface(
-                    i, str(i), radius, mass, COLORS[color]
-                ),
-                mass,
+                name,
+                new_blob_surface(i, name, blob_radius, blob_mass, COLORS[blob_color]),
+                blob_mass,
                 0,
                 0,
                 0,
@@ -345,11 +377,12 @@ class BlobPlotter:
                 0,
                 0,
             )
+            blobs[i] = blob
 
-            if moon:
-                moons.append(self.blobs[i])
+            if is_moon:
+                moons.append(blob)
             else:
-                planets.append(self.blobs[i])
+                planets.append(blob)
 
         self.blob_factory.loading_screen_start(
             len(self.blobs) - 1, "plotting blobs . . . "
@@ -362,6 +395,7 @@ class BlobPlotter:
         if len(moons) > 0:
             self.plot_moons(moons, planets)
 
+        self.populate_arrays()
         self.populate_grid()
 
         self.blob_factory.loading_screen_end(True)
@@ -385,234 +419,216 @@ class BlobPlotter:
             )
             self.blob_factory.loading_screen_add_count()
 
-    def draw_blobs(self: Self) -> None:
+    def draw_blobs(self: Self, redraw: bool = True) -> None:
         """
-        Iterates the blobs according z_axis keys, deletes the ones flagged as dead, calls draw() on the live ones, and repopulates
-        the proximity_grid array according to new coordinates
+        Calls draw() on every blob, furthest (highest z) first, so that nearer blobs are painted over further ones
+        (painter's order, kept in self.z_order from frame to frame). Send False for redraw if nothing has changed
+        since the last draw (e.g. while paused), only the graphics layer's grid check is done then
         """
         self.blob_factory.grid_check(self.proximity_grid)
 
-        for blob in self.blobs:
-            blob.draw()
+        if not redraw:
+            return
+
+        # Depth order barely changes between frames, so sorting last frame's order again is close to O(N)
+        # (the stable sort is a timsort, which runs in linear time on nearly sorted input)
+        neg_z: npt.NDArray = -self.pos[:, 2]
+        self.z_order = self.z_order[np.argsort(neg_z[self.z_order], kind="stable")]
+
+        # Every blob's position scaled down to the universe in one multiply, rather than one blob at a time
+        screen_pos: list = (self.pos * bg_vars.scale_down).tolist()
+        blobs: npt.NDArray = self.blobs
+
+        for i in self.z_order.tolist():
+            blobs[i].draw(screen_pos[i])
 
     def populate_grid(self: Self) -> None:
+        """
+        Rebuilds the proximity_grid array according to the current blob coordinates. Grid keys are worked out
+        for every blob at once from self.pos (same rules as MassiveBlob.grid_key()), and the grid itself is
+        reused, only the cells filled last time are emptied
+        """
+        upper_bound: int = int(bg_vars.grid_key_upper_bound)
 
-        self.proximity_grid = np.empty(
-            [
-                int(bg_vars.grid_key_upper_bound),
-                int(bg_vars.grid_key_upper_bound),
-                int(bg_vars.grid_key_upper_bound),
-            ],
-            dtype=MassiveBlob,
+        if self.proximity_grid.shape != (upper_bound, upper_bound, upper_bound):
+            self.proximity_grid = np.empty(
+                [upper_bound, upper_bound, upper_bound], dtype=MassiveBlob
+            )
+            self.grid_cells = np.empty([0], dtype=np.int64)
+
+        # Flat view of the grid, one cell per key
+        cells: npt.NDArray = self.proximity_grid.reshape(-1)
+        cells[self.grid_cells] = None
+
+        grid_keys: npt.NDArray = (
+            (self.pos * bg_vars.scale_down) / bg_vars.grid_cell_size
+        ).astype(np.int64)
+        np.minimum(grid_keys, bg_vars.grid_key_check_bound, out=grid_keys)
+        # Negative keys index from the end, as they always have
+        grid_keys %= upper_bound
+
+        flat_keys: npt.NDArray = np.ravel_multi_index(
+            grid_keys.T, self.proximity_grid.shape
         )
 
-        for blob in self.blobs:
-            grid_key = blob.grid_key()
+        # Blobs grouped by cell, in their original order within each cell
+        order: npt.NDArray = np.argsort(flat_keys, kind="stable")
+        self.grid_cells, starts = np.unique(flat_keys[order], return_index=True)
+        ends: npt.NDArray = np.append(starts[1:], len(order))
 
-            if self.proximity_grid[grid_key[0]][grid_key[1]][grid_key[2]] is None:
-                self.proximity_grid[grid_key[0]][grid_key[1]][grid_key[2]] = np.array(
-                    [blob], dtype=MassiveBlob
-                )
-            else:
-                self.proximity_grid[grid_key[0]][grid_key[1]][grid_key[2]] = np.append(
-                    self.proximity_grid[grid_key[0]][grid_key[1]][grid_key[2]],
-                    blob,
-                )
+        for cell, start, end in zip(
+            self.grid_cells.tolist(), starts.tolist(), ends.tolist()
+        ):
+            cells[cell] = self.blobs[order[start:end]]
 
-    def update_blobs(self: Self, dt: float = 1 / FRAME_RATE) -> None:
+    def size_arrays(self: Self, num_blobs: int) -> None:
         """
-        Traverses the proximity grid to check blobs for collision and gravitational pull, and populates the z_axis dict
-        The center blob is treated differently to ensure all blobs are checked against its gravitational pull rather than just
-        blobs within its proximity grid range
+        Points the state arrays at the first num_blobs rows of their buffers (only reallocating if there are more
+        blobs than the buffers can hold), so starting over or losing blobs doesn't allocate anything new
         """
-        checked: Dict[int, int] = {}
-        pg: npt.NDArray = self.proximity_grid
-        new_pg: npt.NDArray = None
-
-        def check_blobs_edge(
-            blob1: MassiveBlob,
-            blobs: npt.NDArray,
-            pos_offsets: Tuple[float, float, float],
-            this_dt: Decimal,
-        ) -> None:
-            if blobs is None:
-                return
-
-            for blob2 in blobs:
-                if (id(blob2) != id(blob1)) and (checked.get(id(blob2)) is None):
-
-                    blob2.x += pos_offsets[0]
-                    blob2.y += pos_offsets[1]
-                    blob2.z += pos_offsets[2]
-
-                    bp.gravity_collision(blob1, blob2, this_dt)
-
-                    blob2.x -= pos_offsets[0]
-                    blob2.y -= pos_offsets[1]
-                    blob2.z -= pos_offsets[2]
-
-            bp.edge_detection(blob1)
-
-        def check_grid_edge(blob: MassiveBlob, this_dt: Decimal) -> None:
-
-            gk: Tuple[int, int, int] = blob.grid_key()
-
-            # Using the grid approach for optimization. Instead of every blob checking every blob,
-            # every blob only checks the blobs in their own grid cell and the grid cells surrounding them.
-
-            z_pos_offset: float = 0
-            x_pos_offset: float = 0
-            y_pos_offset: float = 0
-            scaled_universe: float = bg_vars.universe_size * bg_vars.scale_up
-            for z_i_offset in range(-1, 2):
-                z = gk[2] + z_i_offset
-                if z > bg_vars.grid_key_check_bound:
-                    z = 0
-                    z_pos_offset = scaled_universe
-                elif z < 0:
-                    z_pos_offset = -scaled_universe
-                else:
-                    z_pos_offset = 0
-                for x_i_offset in range(-1, 2):
-                    x = gk[0] + x_i_offset
-                    if x > bg_vars.grid_key_check_bound:
-                        x = 0
-                        x_pos_offset = scaled_universe
-                    elif x < 0:
-                        x_pos_offset = -scaled_universe
-                    else:
-                        x_pos_offset = 0
-                    for y_i_offset in range(-1, 2):
-                        y = gk[1] + y_i_offset
-                        if y > bg_vars.grid_key_check_bound:
-                            y = 0
-                            y_pos_offset = scaled_universe
-                        elif y < 0:
-                            y_pos_offset = -scaled_universe
-                        else:
-                            y_pos_offset = 0
-                        # Skip the corners of the cube, worth risking the occasional miss for the performance boost
-                        if x_i_offset != 0 and y_i_offset != 0 and z_i_offset != 0:
-                            continue
-                        check_blobs_edge(
-                            blob,
-                            pg[x][y][z],
-                            (x_pos_offset, y_pos_offset, z_pos_offset),
-                            this_dt,
-                        )
-
-        def check_blobs_escape(
-            blob1: MassiveBlob,
-            blobs: npt.NDArray,
-            this_dt: Decimal,
-        ) -> None:
-            if blobs is None:
-                return
-
-            for blob2 in blobs:
-                if (id(blob2) != id(blob1)) and (checked.get(id(blob2)) is None):
-
-                    bp.gravity_collision(blob1, blob2, this_dt)
-
-        def check_grid_escape(blob: MassiveBlob, this_dt: Decimal) -> None:
-
-            gk: Tuple[int, int, int] = blob.grid_key()
-
-            # Using the grid approach for optimization. Instead of every blob checking every blob,
-            # every blob only checks the blobs in their own grid cell and the grid cells surrounding them.
-
-            for z_i_offset in range(-1, 2):
-                z = gk[2] + z_i_offset
-                if z < 0:
-                    z = 0
-                elif z > bg_vars.grid_key_check_bound:
-                    z = bg_vars.grid_key_check_bound
-                for x_i_offset in range(-1, 2):
-                    x = gk[0] + x_i_offset
-                    if x < 0:
-                        x = 0
-                    elif x > bg_vars.grid_key_check_bound:
-                        x = bg_vars.grid_key_check_bound
-                    for y_i_offset in range(-1, 2):
-                        y = gk[1] + y_i_offset
-                        if y < 0:
-                            y = 0
-                        elif y > bg_vars.grid_key_check_bound:
-                            y = bg_vars.grid_key_check_bound
-
-                        if x_i_offset != 0 and y_i_offset != 0 and z_i_offset != 0:
-                            continue
-                        check_blobs_escape(
-                            blob,
-                            pg[x][y][z],
-                            this_dt,
-                        )
-
-        iterations: int = 1  # round(bg_vars.timescale / bg_vars.timescale_inc)
-        # itr_dt: Decimal = Decimal(dt) * Decimal(
-        #     bg_vars.timescale_inc / bg_vars.timescale
-        # )
-        itr_dt: Decimal = Decimal(dt)
-        check_grid: Callable[[MassiveBlob, Decimal], None] = check_grid_escape
-        if not bg_vars.center_blob_escape:
-            check_grid = check_grid_edge
-
-        for _ in range(iterations):
-
-            del pg
-            pg = self.proximity_grid
-            new_pg = np.empty(
-                [
-                    int(bg_vars.grid_key_upper_bound),
-                    int(bg_vars.grid_key_upper_bound),
-                    int(bg_vars.grid_key_upper_bound),
-                ],
-                dtype=MassiveBlob,
-            )
+        if num_blobs > len(self.pos_buffer):
+            self.pos_buffer = np.zeros([num_blobs, 3], dtype=np.float64)
+            self.vel_buffer = np.zeros([num_blobs, 3], dtype=np.float64)
+            self.prev_pos_buffer = np.zeros([num_blobs, 3], dtype=np.float64)
+            self.mass_buffer = np.zeros([num_blobs], dtype=np.float64)
+            self.radius_buffer = np.zeros([num_blobs], dtype=np.float64)
+
+        self.pos = self.pos_buffer[:num_blobs]
+        self.vel = self.vel_buffer[:num_blobs]
+        self.prev_pos = self.prev_pos_buffer[:num_blobs]
+        self.mass = self.mass_buffer[:num_blobs]
+        self.radius = self.radius_buffer[:num_blobs]
+        self.z_order = np.arange(num_blobs)
+
+    def populate_arrays(self: Self) -> None:
+        """
+        (Re)fills the position, velocity, mass and radius arrays from self.blobs, and binds each blob's
+        position/velocity to its row so both views of the state stay in sync
+        """
+        self.size_arrays(len(self.blobs))
 
-            checked.clear()
+        for i, blob in enumerate(self.blobs):
+            blob.bind_state(self.pos[i], self.vel[i], self.prev_pos[i])
+            self.mass[i] = blob.mass
+            self.radius[i] = blob.orig_radius[0]
 
-            for i in range(1, len(self.blobs)):
-                bp.gravity_collision(self.blobs[0], self.blobs[i], itr_dt)
+    def update_blobs(self: Self, dt: float = 1 / FRAME_RATE) -> None:
+        """
+        Checks all blobs for collision and gravitational pull against each other, advances them, removes the dead
+        ones and repopulates the proximity grid. Gravity is calculated for every pair at once on the state arrays
+        (see populate_arrays() and BlobKernels), only blobs that are actually touching are handed to BlobPhysics
+        one pair at a time
+        """
+        timescale: float = float(Decimal(bg_vars.timescale) * Decimal(dt))
+        pos: npt.NDArray = self.pos
+        vel: npt.NDArray = self.vel
+
+        wrap_size: float = 0.0
+        if not bg_vars.center_blob_escape and bg_vars.wrap_if_no_escape:
+            wrap_size = bg_vars.universe_size * bg_vars.scale_up
+
+        # Collisions, one pair at a time, but only for the pairs that are touching. Pairs are always i < j,
+        # so no pair is checked twice (plain ints and floats, BlobPhysics does scalar math with them)
+        pairs, pair_d = bk.touching_pairs(pos, self.radius, wrap_size)
+
+        # Blobs only die from collisions or escaping, if neither happened there is nothing to compact
+        maybe_dead: bool = len(pairs) > 0
+
+        if maybe_dead:
+            blobs: npt.NDArray = self.blobs
+            collision_detection = bp.collision_detection
+            for (i, j), d in zip(pairs.tolist(), pair_d.tolist()):
+                collision_detection(blobs[i], blobs[j], d)
+
+            # Blobs that swallow others get heavier and bigger (only blobs in a pair can have changed)
+            mass: npt.NDArray = self.mass
+            radius: npt.NDArray = self.radius
+            for i in np.unique(pairs).tolist():
+                blob: MassiveBlob = blobs[i]
+                mass[i] = blob.mass
+                radius[i] = blob.orig_radius[0]
+
+        if bg_vars.center_blob_escape:
+            # If out of Sun's gravitational range, kill it
+            center_d: npt.NDArray = np.linalg.norm(pos - pos[0], axis=1)
+            for i in np.nonzero(center_d >= bp.GRAVITATIONAL_RANGE)[0]:
+                self.blobs[i].dead = True
+                self.blobs[i].escaped = True
+                maybe_dead = True
+
+        if bg_vars.center_blob_escape:
+            # Gravity and advancing every blob by velocity (one frame, with TIMESCALE elapsed time) in one pass
+            bk.step(
+                pos,
+                vel,
+                self.prev_pos,
+                self.mass,
+                bp.g,
+                bp.GRAVITATIONAL_RANGE,
+                timescale,
+                wrap_size,
+            )
+        else:
+            vel += (
+                bk.accelerations(
+                    pos, self.mass, bp.g, bp.GRAVITATIONAL_RANGE, wrap_size
+                )
+                * timescale
+            )
 
-            if not bg_vars.center_blob_escape:
-                bp.edge_detection(self.blobs[0])
+            # Edges have to be checked between the velocity and position updates
+            if wrap_size > 0.0:
+                bp.wrap_edges(pos, vel, wrap_size)
+            else:
+                bp.bounce_edges(
+                    pos, vel, self.radius, self.universe_size_h * bg_vars.scale_up
+                )
 
-            self.blobs[0].advance(itr_dt)
+            # Advance every blob by velocity (one frame, with TIMESCALE elapsed time)
+            self.prev_pos[:] = pos
+            pos += vel * timescale
 
-            checked[id(self.blobs[0])] = 1
+        if maybe_dead:
+            self.remove_dead_blobs()
 
-            for blob in np.flip(self.blobs):
+        self.populate_grid()
 
-                check_grid(blob, itr_dt)
+    def remove_dead_blobs(self: Self) -> None:
+        """
+        Destroys the blobs flagged as dead and compacts self.blobs and the state arrays with a single
+        boolean mask (rather than deleting one blob at a time), in place within the state buffers
+        """
+        alive: npt.NDArray = np.fromiter(
+            (not blob.dead for blob in self.blobs), dtype=bool, count=len(self.blobs)
+        )
 
-                blob.advance(itr_dt)
+        if alive.all():
+            return
 
-                checked[id(blob)] = 1
+        for blob in self.blobs[~alive]:
+            if blob.swallowed:
+                self.blobs_swallowed += 1
+            elif blob.escaped:
+                self.blobs_escaped += 1
+            blob.destroy()
 
-                if blob.dead:
-                    if blob.swallowed:
-                        self.blobs_swallowed += 1
-                    elif blob.escaped:
-                        self.blobs_escaped += 1
-                    self.blobs = np.delete(self.blobs, np.where(self.blobs == blob)[0])
-                    blob.destroy()
-                else:
+        mass: npt.NDArray = self.mass[alive]
+        radius: npt.NDArray = self.radius[alive]
 
-                    grid_key = blob.grid_key()
+        # Painter's order of the survivors, renumbered to their new rows, so it's still nearly sorted
+        new_index: npt.NDArray = np.cumsum(alive) - 1
+        z_order: npt.NDArray = new_index[self.z_order[alive[self.z_order]]]
 
-                    if new_pg[grid_key[0]][grid_key[1]][grid_key[2]] is None:
-                        new_pg[grid_key[0]][grid_key[1]][grid_key[2]] = np.array(
-                            [blob], dtype=MassiveBlob
-                        )
-                    else:
-                        new_pg[grid_key[0]][grid_key[1]][grid_key[2]] = np.append(
-                            new_pg[grid_key[0]][grid_key[1]][grid_key[2]],
-                            blob,
-                        )
+        self.blobs = self.blobs[alive]
+        self.size_arrays(len(self.blobs))
+        self.mass[:] = mass
+        self.radius[:] = radius
+        self.z_order = z_order
 
-            del self.proximity_grid
-            self.proximity_grid = new_pg
+        # Blobs only ever move to an earlier (or the same) row, so moving them in order never
+        # overwrites a row that is still to be moved
+        for i, blob in enumerate(self.blobs):
+            blob.bind_state(self.pos[i], self.vel[i], self.prev_pos[i])
 
     def plot_center_blob(self: Self) -> None:
         """Creates and places the center blob and adds it to self.blobs[0]"""
@@ -671,6 +687,8 @@ class BlobPlotter:
         x += (clearance / 2) * blob_partition
         y -= (clearance / 2) * blob_partition
 
+        positions: npt.NDArray = np.empty([len(planets), 3], dtype=np.float64)
+
         for i in range(0, len(planets)):
 
             # Get x and y coordinates for this blob
@@ -698,8 +716,9 @@ class BlobPlotter:
                 elif x < scaled_half_universe_w:
                     y -= blob_partition
 
-            self.add_pos_vel(planets[i], x, y, z)
-            self.blob_factory.loading_screen_add_count()
+            positions[i] = (x, y, z)
+
+        self.add_pos_vels(planets, positions)
 
     def plot_circular_grid(self: Self, planets: list[MassiveBlob]) -> None:
         """Iterates through blobs and plots them in a circular grid configuration around the center blob"""
@@ -707,6 +726,12 @@ class BlobPlotter:
         scaled_half_universe_w: float = self.blobs[0].x
         scaled_half_universe_h: float = self.blobs[0].y
 
+        # Loop invariants, bound to locals once rather than looked up every iteration
+        two_pi: float = math.pi * 2
+        sin = math.sin
+        cos = math.cos
+        random = blob_random.random
+
         orbiting_blobs: int = len(planets)
         blobs_per_ring: int = 5
         if self.num_moons > 0:
@@ -714,10 +739,14 @@ class BlobPlotter:
 
         # Iterators for circular grid placement, blobs will be placed in ever
         # increasing sized circles around the center blob
-        plot_phi: float = 0.0
+        ring_step: int = 0
         plot_phi_offset: float = 0.0
         plot_theta: float = math.pi * 0.5
 
+        # plot_theta never changes, neither do these
+        sin_theta: float = sin(plot_theta)
+        cos_theta: float = cos(plot_theta)
+
         # How much the radius will increase each time we move to the next biggest
         # circle around the center blob (the size will be some multiple of the diameter of the biggest
         # blob)
@@ -730,7 +759,7 @@ class BlobPlotter:
         arc: float = (math.pi * (plot_radius * 2)) / blobs_per_ring
 
         # How far apart each blob will be on each circumference
-        chord_scaled: float = 2 * plot_radius * math.sin(arc / (plot_radius * 2))
+        chord_scaled: float = 2 * plot_radius * sin(arc / (plot_radius * 2))
 
         if chord_scaled < ((bg_vars.max_radius * 3) * bg_vars.scale_up):
             chord_scaled = (bg_vars.max_radius * 3) * bg_vars.scale_up
@@ -744,31 +773,31 @@ class BlobPlotter:
         # pi_inc: float = (math.pi * 2) / 5
 
         # Divy up the remainder for a more even distribution
-        pi_inc += ((math.pi * 2) % pi_inc) / ((math.pi * 2) / pi_inc)
+        pi_inc += (two_pi % pi_inc) / (two_pi / pi_inc)
 
         blobs_left: int = orbiting_blobs
 
         stagger_radius: bool = False
 
-        if ((math.pi * 2) / pi_inc) > (orbiting_blobs):
+        if (two_pi / pi_inc) > (orbiting_blobs):
             stagger_radius = True
-            pi_inc = (math.pi * 2) / (orbiting_blobs)
+            pi_inc = two_pi / (orbiting_blobs)
             plot_radius_partition /= 2
             # plot_radius -= AU
 
-        for i in range(0, len(planets)):
+        # How many blobs fit around this circle, pi_inc apart (rounded so a ratio that should be a whole
+        # number isn't one short because of float error)
+        ring_size: int = max(1, int(round(two_pi / pi_inc, 8)))
 
-            self.display.update()
+        positions: npt.NDArray = np.empty([len(planets), 3], dtype=np.float64)
+
+        for i in range(0, len(planets)):
 
             # Circular grid x,y plot for this blob
             # Get x and y for this blob, vars set up from last iteration or initial setting
-            x = scaled_half_universe_w + plot_radius * math.sin(plot_theta) * math.cos(
-                plot_phi_offset
-            )
-            y = scaled_half_universe_h + plot_radius * math.sin(plot_theta) * math.sin(
-                plot_phi_offset
-            )
-            z = scaled_half_universe_h + plot_radius * math.cos(plot_theta)
+            x = scaled_half_universe_w + plot_radius * sin_theta * cos(plot_phi_offset)
+            y = scaled_half_universe_h + plot_radius * sin_theta * sin(plot_phi_offset)
+            z = scaled_half_universe_h + plot_radius * cos_theta
 
             blobs_left -= 1
             # Set up vars for next iteration, move the "clock dial" another notch,
@@ -776,11 +805,11 @@ class BlobPlotter:
 
             if stagger_radius:
                 plot_radius += plot_radius_partition + (
-                    blob_random.random() * plot_radius_partition
+                    random() * plot_radius_partition
                 )
 
-            if round(plot_phi + pi_inc, 8) > round((math.pi * 2) - (pi_inc), 8):
-                plot_phi = 0.0
+            if ring_step + 1 >= ring_size:
+                ring_step = 0
 
                 # Increase the radius for the next go around the center blob
                 plot_radius += plot_radius_partition
@@ -789,40 +818,60 @@ class BlobPlotter:
                 # we get chord_scaled length between each blob center)
                 pi_inc = math.asin(chord_scaled / (plot_radius * 2)) * 2
                 # Divy up the remainder for a more even distribution
-                pi_inc += ((math.pi * 2) % pi_inc) / ((math.pi * 2) / pi_inc)
+                pi_inc += (two_pi % pi_inc) / (two_pi / pi_inc)
+
+                if blobs_left > 0 and (two_pi / pi_inc) > blobs_left:
+                    pi_inc = two_pi / blobs_left
 
-                if blobs_left > 0 and ((math.pi * 2) / pi_inc) > blobs_left:
-                    pi_inc = (math.pi * 2) / blobs_left
+                ring_size = max(1, int(round(two_pi / pi_inc, 8)))
 
-                plot_phi_offset = blob_random.random() * (math.pi * 2)
+                plot_phi_offset = random() * two_pi
 
             else:
-                plot_phi += pi_inc
+                ring_step += 1
                 plot_phi_offset += pi_inc
 
-            self.add_pos_vel(planets[i], x, y, z)
-            self.blob_factory.loading_screen_add_count()
+            positions[i] = (x, y, z)
+
+        self.add_pos_vels(planets, positions)
 
     def add_pos_vel(
         self: Self, blob: MassiveBlob, x: float, y: float, z: float
     ) -> None:
         """Adds z,y,z to given blob, and configures velocity for orbit around center blob"""
-        velocity: float = 0.0
-        # Figure out velocity for this blob
-        dx = self.blobs[0].x - x
-        dy = self.blobs[0].y - y
-        dz = self.blobs[0].z - z
-        d = math.sqrt(dx**2 + dy**2 + dz**2)
+        self.add_pos_vels([blob], np.array([[x, y, z]], dtype=np.float64))
+
+    def add_pos_vels(
+        self: Self, blobs: list[MassiveBlob], positions: npt.NDArray
+    ) -> None:
+        """
+        Adds the (N,3) positions to the given blobs, and configures their velocities for orbit around center blob.
+        The velocities are worked out for every blob at once, the blobs are then placed (and drawn, for the
+        loading screen) one at a time
+        """
+        # Figure out velocity for these blobs
+        center_blob: MassiveBlob = self.blobs[0]
+        r: npt.NDArray = center_blob.pos - positions
+        d: npt.NDArray = np.linalg.norm(r, axis=1)
 
         # get velocity for a perfect orbit around center blob
-        velocity = math.sqrt(G * bg_vars.center_blob_mass / d)
+        velocity: npt.NDArray = np.sqrt(G * bg_vars.center_blob_mass / d)
 
         if not self.start_perfect_orbit:
-            for _ in range(1, blob_random.randint(1, 2)):
-                velocity *= blob_random.randint(0, 1) + (blob_random.random())
+            # Half the blobs get their velocity multiplied by a random 0.0 - 2.0
+            num_blobs: int = len(blobs)
+            velocity = np.where(
+                blob_random.randint_array(1, 2, num_blobs) == 2,
+                velocity
+                * (
+                    blob_random.randint_array(0, 1, num_blobs)
+                    + blob_random.random_array(num_blobs)
+                ),
+                velocity,
+            )
 
-        theta = math.acos(dz / d)
-        phi = math.atan2(dy, dx)
+        theta: npt.NDArray = np.arccos(r[:, 2] / d)
+        phi: npt.NDArray = np.arctan2(r[:, 1], r[:, 0])
 
         if self.start_angular_chaos:
             # Add some chaos to starting trajectory
@@ -831,29 +880,33 @@ class BlobPlotter:
         # turn 90 degrees from pointing center for beginning velocity (orbit)
         phi = phi - (math.pi * 0.5)
 
-        velocityx = velocity * math.sin(theta) * math.cos(phi)
-        velocityy = velocity * math.sin(theta) * math.sin(phi)
-        velocityz = velocity * math.cos(theta)
-
-        # Phew, let's instantiate this puppy . . .
-        blob.update_pos_vel(
-            x,
-            y,
-            z,
-            velocityx + blob.vx,
-            velocityy + blob.vy,
-            velocityz + blob.vz,
+        velocities: npt.NDArray = np.stack(
+            (
+                velocity * np.sin(theta) * np.cos(phi),
+                velocity * np.sin(theta) * np.sin(phi),
+                velocity * np.cos(theta),
+            ),
+            axis=1,
         )
 
-        if bg_vars.start_pos_rotate_x:
-            blob.rotate_x()
+        loading_screen_add_count = self.blob_factory.loading_screen_add_count
 
-        if bg_vars.start_pos_rotate_y:
-            blob.rotate_y()
+        for blob, (x, y, z), (vx, vy, vz) in zip(
+            blobs, positions.tolist(), velocities.tolist()
+        ):
+            # Phew, let's instantiate this puppy . . .
+            blob.update_pos_vel(x, y, z, vx + blob.vx, vy + blob.vy, vz + blob.vz)
 
-        if bg_vars.start_pos_rotate_z:
-            blob.rotate_z()
+            if bg_vars.start_pos_rotate_x:
+                blob.rotate_x()
 
-        blob.draw()
+            if bg_vars.start_pos_rotate_y:
+                blob.rotate_y()
 
-        self.display.update()
+            if bg_vars.start_pos_rotate_z:
+                blob.rotate_z()
+
+            blob.draw()
+
+            self.display.update()
+            loading_screen_add_count()
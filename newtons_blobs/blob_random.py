@@ -9,6 +9,7 @@ by Jason Mott, copyright 2024
 
 import secrets
 import numpy as np
+import numpy.typing as npt
 
 from .globals import *
 
@@ -34,6 +35,12 @@ class blob_random:
     randint(a: int, b: int) -> int
         Returns a random integer from a low (inclusive) to b high (inclusive)
 
+    random_array(size: int) -> npt.NDArray
+        Returns an array of random floats in the half-open interval 0.0 - 1.0
+
+    randint_array(a: int, b: int, size: int) -> npt.NDArray
+        Returns an array of random integers from a low (inclusive) to b high (inclusive)
+
     """
 
     np_random = np.random.default_rng(secrets.randbits(1024))
@@ -60,3 +67,20 @@ class blob_random:
         # )
         b += 1
         return blob_random.np_random.integers(a, b)
+
+    @staticmethod
+    def random_array(size: int) -> npt.NDArray:
+        """Returns an array of random floats in the half-open interval 0.0 - 1.0"""
+
+        blob_random.np_random = np.random.default_rng(secrets.randbits(1024))
+
+        return blob_random.np_random.random(size)
+
+    @staticmethod
+    def randint_array(a: int, b: int, size: int) -> npt.NDArray:
+        """Returns an array of random integers from a low (inclusive) to b high (inclusive)"""
+
+        blob_random.np_random = np.random.default_rng(secrets.randbits(1024))
+
+        b += 1
+        return blob_random.np_random.integers(a, b, size)
@@ -64,8 +64,8 @@ class BlobRunner:
         Returns float number of units determined by divisor. E.g., if YEARS is divisor,
         returns number of years elapsed since last start.
 
-    display_elapsed_time() -> None
-        Draws the elapsed time to the display instance
+    display_elapsed_time(display_h: float = None) -> None
+        Draws the elapsed time to the display instance (display_h is the display height, if already known)
 
 
     """
@@ -98,6 +98,8 @@ class BlobRunner:
         self.auto_save_load: bool = AUTO_SAVE_LOAD
         self.running: bool = True
         self.paused: bool = False
+        # Whether the blobs have been drawn since they last changed (only matters while paused)
+        self.blobs_drawn: bool = False
         self.elapsed_time: float = 0
         self.show_stats: bool = True
         self.message: str = None
@@ -208,6 +210,7 @@ class BlobRunner:
 
         def pause_game() -> None:
             self.paused = not self.paused
+            self.blobs_drawn = False
             if self.paused:
                 self.blob_plotter.blobs[0].pause = True
             else:
@@ -224,6 +227,7 @@ class BlobRunner:
             self.message = None
             self.message_counter = 0
             self.blob_plotter.start_over()
+            self.blobs_drawn = False
             self.blob_save_load.save(True, "last_blob_plot.json")
 
         def toggle_square_grid() -> None:
@@ -341,12 +345,18 @@ class BlobRunner:
         self.display.quit()
 
     def render_frame(self: Self) -> None:
-        """Calls all the draw methods to display a frame on the screen/monitor"""
+        """
+        Calls all the draw methods to display a frame on the screen/monitor (while paused, the blobs are only drawn
+        again if something changed them, the universe keeps the last drawing)
+        """
+        redraw: bool = not self.paused or not self.blobs_drawn
 
         self.display.fill(BACKGROUND_COLOR)
-        self.universe.fill(BACKGROUND_COLOR)
+        if redraw:
+            self.universe.fill(BACKGROUND_COLOR)
 
-        self.blob_plotter.draw_blobs()
+        self.blob_plotter.draw_blobs(redraw)
+        self.blobs_drawn = True
 
         self.display.draw_universe(self.universe)
 
@@ -365,8 +375,9 @@ class BlobRunner:
         self.display.fps_clock_tick(FRAME_RATE)
 
         if not self.paused:
-            self.blob_plotter.update_blobs(self.display.fps_get_dt())
-            self.elapsed_time += bg_vars.timescale * self.display.fps_get_dt()
+            dt: float = self.display.fps_get_dt()
+            self.blob_plotter.update_blobs(dt)
+            self.elapsed_time += bg_vars.timescale * dt
 
         self.display.update()
 
@@ -375,40 +386,35 @@ class BlobRunner:
         Draws statistical information to the display instance, and if message is sent, will also draw that
         text in the middle of the display instance.
         """
+        display_w: float = self.display.get_width()
+        display_h: float = self.display.get_height()
+        blit_text = self.display.blit_text
+
         if message is not None:
             # Center, showing message, if any
-            self.display.blit_text(
+            blit_text(
                 message,
-                (
-                    (self.display.get_width() / 2),
-                    (self.display.get_height() / 2),
-                ),
+                (display_w / 2, display_h / 2),
                 (BlobDisplay.TEXT_CENTER_x, BlobDisplay.TEXT_CENTER_z),
             )
 
         if self.show_stats:
             # Top left, showing sun mass
-            self.display.blit_text(
+            blit_text(
                 f"Sun mass: {self.blob_plotter.blobs[0].mass}",
-                (
-                    20,
-                    self.display.get_height() - 20,
-                ),
+                (20, display_h - 20),
                 (BlobDisplay.TEXT_LEFT, BlobDisplay.TEXT_TOP),
             )
 
             # Top right, showing number of orbiting blobs
-            self.display.blit_text(
+            blit_text(
                 f"Orbiting blobs: {self.blob_plotter.blobs.size - 1}",
-                (
-                    self.display.get_width() - 20,
-                    self.display.get_height() - 20,
-                ),
+                (display_w - 20, display_h - 20),
                 (BlobDisplay.TEXT_RIGHT, BlobDisplay.TEXT_TOP),
             )
 
             # Bottom left, showing number of blobs swallowed by the sun
-            self.display.blit_text(
+            blit_text(
                 f"Blobs swallowed by blobs: {self.blob_plotter.blobs_swallowed}",
                 (
                     20,
@@ -419,16 +425,13 @@ class BlobRunner:
 
             if bg_vars.center_blob_escape:
                 # Bottom right, showing number of blobs escaped the sun
-                self.display.blit_text(
+                blit_text(
                     f"Blobs escaped Sun: {self.blob_plotter.blobs_escaped}",
-                    (
-                        self.display.get_width() - 20,
-                        20,
-                    ),
+                    (display_w - 20, 20),
                     (BlobDisplay.TEXT_RIGHT, BlobDisplay.TEXT_BOTTOM),
                 )
 
-            self.display_elapsed_time()
+            self.display_elapsed_time(display_h)
 
     def get_elapsed_time_in(self: Self, divisor: float) -> float:
         """
@@ -438,13 +441,16 @@ class BlobRunner:
         """
         return round(self.elapsed_time / divisor, 2)
 
-    def display_elapsed_time(self: Self) -> None:
-        """Draws the elapsed time to the display instance"""
+    def display_elapsed_time(self: Self, display_h: float = None) -> None:
+        """Draws the elapsed time to the display instance (display_h is the display height, if already known)"""
+        if display_h is None:
+            display_h = self.display.get_height()
+
         text: str = ""
         if self.paused:
             text = "Paused"
         self.display.blit_text(
             f"Years elapsed: {self.get_elapsed_time_in(YEARS)} {text}\nTimescale: {self.timescale_str}",
-            (20, self.display.get_height() - 20),
+            (20, display_h - 20),
             (BlobDisplay.TEXT_LEFT, BlobDisplay.TEXT_TOP_PLUS),
         )
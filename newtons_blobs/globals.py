@@ -61,8 +61,8 @@ CENTER_BLOB_SCALE = 20
 
 BLOB_SCALE = 20
 
-SCALE_DOWN = AU_SCALE_FACTOR / AU  # 1 AU = SCALE_FACTOR pixels
-SCALE_UP = AU / AU_SCALE_FACTOR  # SCALE_FACTOR pixels = 1 AU
+SCALE_DOWN = AU_SCALE_FACTOR / AU  # 1 AU = AU_SCALE_FACTOR pixels
+SCALE_UP = AU / AU_SCALE_FACTOR  # AU_SCALE_FACTOR pixels = 1 AU
 
 FRAME_RATE = 60  # there are FRAME_RATE frames per second
 CLOCK_FPS = False
@@ -141,6 +141,13 @@ GRID_CELL_SIZE = int(UNIVERSE_SIZE / (UNIVERSE_SCALE * GRID_CELLS_PER_AU))
 GRID_KEY_UPPER_BOUND = int(UNIVERSE_SIZE / GRID_CELL_SIZE)
 GRID_KEY_CHECK_BOUND = GRID_KEY_UPPER_BOUND - 1
 
+# Barnes-Hut octree gravity (needs Numba) is used once there are more than this many blobs
+BARNES_HUT_MIN_BLOBS = 256
+# A tree cell is treated as a single blob when cell size / distance < BARNES_HUT_THETA
+BARNES_HUT_THETA = 0.5
+# Gravity is calculated on the GPU (needs Numba and a CUDA device) once there are this many blobs
+CUDA_MIN_BLOBS = 4096
+
 COLORS = [
     (221, 110, 66),  # rgb(221, 110, 66)
     (33, 118, 174),  # rgb(33, 118, 174)
@@ -7,7 +7,6 @@ by Jason Mott, copyright 2024
 """
 
 from decimal import *
-from collections import deque
 from typing import Any, ClassVar, Dict, Tuple, Self
 
 import numpy as np
@@ -72,8 +71,9 @@ class MassiveBlob:
     grid_key() -> Tuple[int]
         Returns an x,y,z tuple indicating this blob's position in the proximity grid (not the display screen)
 
-    draw() -> None
-        Tells the instance to call draw on the BlobSurface instance
+    draw(screen_pos: Tuple[float, float, float] = None) -> None
+        Tells the instance to call draw on the BlobSurface instance, at screen_pos if provided (this blob's
+        position already scaled down to the universe)
 
     fake_blob_z() -> None
         Called by __init__(), advance(), update_pos_vel(), adjusts radius size to to show perspective
@@ -97,6 +97,9 @@ class MassiveBlob:
     rotate_z() -> None
         For starting position, swap x and y to get a different angle of viewing
 
+    bind_state(pos: npt.NDArray, vel: npt.NDArray, prev_pos: npt.NDArray) -> None
+        Copies the current position/velocity into the provided arrays and uses them as storage from now on
+
     """
 
     __slots__ = (
@@ -109,17 +112,13 @@ class MassiveBlob:
         "scaled_radius",
         "orig_radius",
         "_mass",
-        "x",
-        "y",
-        "z",
-        "vx",
-        "vy",
-        "vz",
+        "pos",
+        "vel",
+        "prev_pos",
         "_dead",
         "_swallowed",
         "escaped",
         "pause",
-        "pos_log",
     )
 
     center_blob_x: ClassVar[float] = bg_vars.universe_size_w / 2
@@ -153,20 +152,91 @@ class MassiveBlob:
         self.radius = blob_surface.radius
         self._mass: float = None
         self.mass = mass
-        self.x: float = x
-        self.y: float = y
-        self.z: float = z
 
-        self.vx: float = vx  # x velocity per frame
-        self.vy: float = vy  # y velocity per frame
-        self.vz: float = vz  # z velocity per frame
+        # Position and velocity live in small arrays so that BlobPlotter can swap them
+        # out for views into its own (N,3) arrays, see bind_state()
+        self.pos: npt.NDArray = np.array([x, y, z], dtype=np.float64)
+        self.vel: npt.NDArray = np.array([vx, vy, vz], dtype=np.float64)
+        self.prev_pos: npt.NDArray = self.pos.copy()
+
         self._dead: bool = False
         self._swallowed: bool = False
         self.escaped: bool = False
         self.pause: bool = False
-        self.pos_log: deque[npt.NDArray] = deque(
-            [np.array([x, y, z], dtype=float), np.array([x, y, z], dtype=float)]
-        )
+
+    @property
+    def x(self: Self) -> float:
+        """Returns the x coordinate of the blob"""
+        return self.pos[0]
+
+    @x.setter
+    def x(self: Self, x: float) -> None:
+        """Sets the x coordinate of the blob"""
+        self.pos[0] = x
+
+    @property
+    def y(self: Self) -> float:
+        """Returns the y coordinate of the blob"""
+        return self.pos[1]
+
+    @y.setter
+    def y(self: Self, y: float) -> None:
+        """Sets the y coordinate of the blob"""
+        self.pos[1] = y
+
+    @property
+    def z(self: Self) -> float:
+        """Returns the z coordinate of the blob"""
+        return self.pos[2]
+
+    @z.setter
+    def z(self: Self, z: float) -> None:
+        """Sets the z coordinate of the blob"""
+        self.pos[2] = z
+
+    @property
+    def vx(self: Self) -> float:
+        """Returns the x velocity of the blob"""
+        return self.vel[0]
+
+    @vx.setter
+    def vx(self: Self, vx: float) -> None:
+        """Sets the x velocity of the blob"""
+        self.vel[0] = vx
+
+    @property
+    def vy(self: Self) -> float:
+        """Returns the y velocity of the blob"""
+        return self.vel[1]
+
+    @vy.setter
+    def vy(self: Self, vy: float) -> None:
+        """Sets the y velocity of the blob"""
+        self.vel[1] = vy
+
+    @property
+    def vz(self: Self) -> float:
+        """Returns the z velocity of the blob"""
+        return self.vel[2]
+
+    @vz.setter
+    def vz(self: Self, vz: float) -> None:
+        """Sets the z velocity of the blob"""
+        self.vel[2] = vz
+
+    def bind_state(
+        self: Self, pos: npt.NDArray, vel: npt.NDArray, prev_pos: npt.NDArray
+    ) -> None:
+        """
+        Copies the current position/velocity into the provided arrays (normally row views of
+        the BlobPlotter state arrays) and uses them as this blob's storage from now on
+        """
+        pos[:] = self.pos
+        vel[:] = self.vel
+        prev_pos[:] = self.prev_pos
+        self.pos = pos
+        self.vel = vel
+        self.prev_pos = prev_pos
 
     @property
     def radius(self: Self) -> float:
@@ -315,11 +385,19 @@ class MassiveBlob:
             z,
         )
 
-    def draw(self: Self) -> None:
-        """Tells the instance to call draw on the BlobSurface instance"""
-        x = self.x * bg_vars.scale_down
-        y = self.y * bg_vars.scale_down
-        z = self.z * bg_vars.scale_down
+    def draw(self: Self, screen_pos: Tuple[float, float, float] = None) -> None:
+        """
+        Tells the instance to call draw on the BlobSurface instance. screen_pos is this blob's position already
+        scaled down to the universe (BlobPlotter scales every blob at once), it is worked out here if not provided
+        """
+        if screen_pos is None:
+            scale_down: float = bg_vars.scale_down
+            screen_pos = (
+                self.pos[0] * scale_down,
+                self.pos[1] * scale_down,
+                self.pos[2] * scale_down,
+            )
+        x, y, z = screen_pos
 
         if self.name != CENTER_BLOB_NAME:
             self.blob_surface.draw((x, y, z), LIGHTING)
@@ -337,26 +415,9 @@ class MassiveBlob:
 
         timescale: float = float(Decimal(bg_vars.timescale) * dt)
 
-        # Advance x by velocity (one frame, with TIMESCALE elapsed time)
-        self.x += self.vx * timescale
-
-        # Advance y by velocity (one frame, with TIMESCALE elapsed time)
-        self.y += self.vy * timescale
-
-        # Advance z by velocity (one frame, with TIMESCALE elapsed time)
-        self.z += self.vz * timescale
-
-        self.pos_log.append(
-            np.array(
-                [
-                    self.x * bg_vars.scale_down,
-                    self.y * bg_vars.scale_down,
-                    self.z * bg_vars.scale_down,
-                ],
-                dtype=float,
-            )
-        )
-        self.pos_log.popleft()
+        # Advance x,y,z by velocity (one frame, with TIMESCALE elapsed time)
+        self.prev_pos[:] = self.pos
+        self.pos += self.vel * timescale
 
     def destroy(self: Self) -> None:
         """Call when no longer needed, so it can clean up and disappear"""